@@ -0,0 +1,260 @@
+import bpy, argparse, os, sys, time, subprocess
+from concurrent.futures import ThreadPoolExecutor
+from .Functions import AOBakeJob, run_ao_bake_job
+
+#---- Headless AO Batch Bake ----#
+#scriptable AO to vertex color, settings are passed explicitly instead of read from the panel.
+#the addon has to be enabled, everything after -- goes to main():
+#   blender --background level.blend --python-expr "import <addon>.VCT.Batch as batch; batch.main()" -- --channel G
+#   blender --background --python-expr "import <addon>.VCT.Batch as batch; batch.main()" -- --directory levels/ --workers 4
+#a directory run starts one background blender per file, progress of every child is streamed to stdout.
+
+ADDON_MODULE = __name__.rsplit(".", 2)[0]
+LOG_PREFIX = "[VCT AO]"
+
+class AOBakeSettings:
+    """
+    explicit AO bake settings, mirroring the ao_ scene properties so a headless run doesn't depend on the UI state
+    """
+    PROPERTY_NAMES = {
+        "channel": "ao_vertex_channel",
+        "engine": "ao_engine",
+        "uv_index": "ao_uv_index",
+        "texture_size": "ao_texture_size",
+        "adaptive_size": "ao_adaptive_size",
+        "texels_per_corner": "ao_texels_per_corner",
+        "batch": "ao_batch_bake",
+        "filter_type": "ao_filter",
+        "filter_taps": "ao_filter_taps",
+        "ray_count": "ao_ray_count",
+        "ray_distance": "ao_ray_distance",
+        "cosine_weighted": "ao_cosine_weighted",
+        "incremental": "ao_incremental",
+    }
+
+    def __init__(self, channel='R', engine='BAKE', uv_index=0, texture_size='1024', batch=True, filter_type='NEAREST',
+                 filter_taps=3, ray_count=64, ray_distance=1.0, cosine_weighted=True, samples=None, device='CPU',
+                 adaptive_size=False, texels_per_corner=16.0, incremental=False):
+        self.channel = channel
+        self.engine = engine
+        self.uv_index = uv_index
+        self.texture_size = texture_size
+        self.batch = batch
+        self.filter_type = filter_type
+        self.filter_taps = filter_taps
+        self.ray_count = ray_count
+        self.ray_distance = ray_distance
+        self.cosine_weighted = cosine_weighted
+        self.samples = samples
+        self.device = device
+        self.adaptive_size = adaptive_size
+        self.texels_per_corner = texels_per_corner
+        self.incremental = incremental
+
+    @classmethod
+    def from_properties(cls, VCTproperties, samples=None, device='CPU'):
+        settings = cls(samples=samples, device=device)
+        for field, property_name in cls.PROPERTY_NAMES.items():
+            setattr(settings, field, getattr(VCTproperties, property_name))
+        return settings
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(
+            channel=args.channel, engine=args.engine, uv_index=args.uv_index, texture_size=args.texture_size,
+            batch=not args.no_batch, filter_type=args.filter, filter_taps=args.taps, ray_count=args.rays,
+            ray_distance=args.distance, cosine_weighted=not args.no_cosine, samples=args.samples, device=args.device,
+            adaptive_size=args.adaptive_size, texels_per_corner=args.texels_per_corner, incremental=args.incremental,
+        )
+
+    def to_args(self) -> list:
+        """
+        command line flags that rebuild these settings through from_args, used to forward them to child processes
+        """
+        args = [
+            "--channel", self.channel, "--engine", self.engine, "--uv-index", str(self.uv_index),
+            "--texture-size", self.texture_size, "--filter", self.filter_type, "--taps", str(self.filter_taps),
+            "--rays", str(self.ray_count), "--distance", str(self.ray_distance), "--device", self.device,
+            "--texels-per-corner", str(self.texels_per_corner),
+        ]
+        if self.adaptive_size:
+            args.append("--adaptive-size")
+        if self.incremental:
+            args.append("--incremental")
+        if not self.batch:
+            args.append("--no-batch")
+        if not self.cosine_weighted:
+            args.append("--no-cosine")
+        if self.samples is not None:
+            args += ["--samples", str(self.samples)]
+        return args
+
+    def apply(self, scene) -> dict:
+        """
+        write the settings to the scene, return the previous values for restore()
+        """
+        VCTproperties = scene.vct_properties
+        previous = {}
+        for field, property_name in self.PROPERTY_NAMES.items():
+            previous[property_name] = getattr(VCTproperties, property_name)
+            setattr(VCTproperties, property_name, getattr(self, field))
+        previous["cycles.device"] = scene.cycles.device
+        previous["cycles.samples"] = scene.cycles.samples
+        scene.cycles.device = self.device
+        if self.samples is not None:
+            scene.cycles.samples = self.samples
+        return previous
+
+    @staticmethod
+    def restore(scene, previous):
+        VCTproperties = scene.vct_properties
+        for name, value in previous.items():
+            if name.startswith("cycles."):
+                setattr(scene.cycles, name[len("cycles."):], value)
+            else:
+                setattr(VCTproperties, name, value)
+
+def print_progress(name, done, total, seconds):
+    print(f"{LOG_PREFIX} {done}/{total} {name} {seconds:.2f}s", flush=True)
+
+def bake_objects(objects, settings, progress=print_progress, context=None):
+    """
+    bake AO into the vertex colors of the given objects with explicit settings, independent of the selection
+    progress(name, done, total, seconds) is called after every object, seconds being the time since the previous one
+    """
+    context = context or bpy.context
+    scene = context.scene
+    meshes = [obj for obj in objects if obj.type == 'MESH' and obj.visible_get()]
+    if not meshes:
+        return {'CANCELLED'}
+    if context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT', toggle=False)
+
+    last = [time.perf_counter()]
+    def report(mesh, done, total):
+        now = time.perf_counter()
+        if progress:
+            progress(mesh.name, done, total, now - last[0])
+        last[0] = now
+
+    previous = settings.apply(scene)
+    try:
+        job = AOBakeJob(context, meshes, report)
+        result = run_ao_bake_job(job)
+    finally:
+        settings.restore(scene, previous)
+    if 'FINISHED' in result and settings.incremental:
+        print(f"{LOG_PREFIX} {job.summary()}", flush=True)
+    if job.failures:
+        print(f"{LOG_PREFIX} {job.failure_report()}", flush=True)
+    return result
+
+def bake_current_file(settings, object_names=None, save=True, progress=print_progress) -> set:
+    """
+    bake the named objects, or every visible mesh of the view layer, of the open .blend and save it back
+    """
+    start = time.perf_counter()
+    context = bpy.context
+    if object_names:
+        objects = [bpy.data.objects[name] for name in object_names if name in bpy.data.objects]
+    else:
+        objects = [obj for obj in context.view_layer.objects if obj.type == 'MESH']
+
+    result = bake_objects(objects, settings, progress, context)
+    if 'FINISHED' in result and save and bpy.data.filepath:
+        bpy.ops.wm.save_mainfile()
+    state = "done" if 'FINISHED' in result else "skipped, nothing to bake"
+    print(f"{LOG_PREFIX} {bpy.data.filepath or 'untitled'} {state} in {time.perf_counter() - start:.2f}s", flush=True)
+    return result
+
+def bake_file(filepath, settings, object_names=None, save=True, progress=print_progress) -> set:
+    bpy.ops.wm.open_mainfile(filepath=filepath)
+    return bake_current_file(settings, object_names, save, progress)
+
+def blend_files_in(directory) -> list:
+    files = []
+    for root, _, names in os.walk(directory):
+        files += [os.path.join(root, name) for name in names if name.endswith(".blend")]
+    return sorted(files)
+
+def _run_child(command, filepath) -> int:
+    name = os.path.basename(filepath)
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    for line in process.stdout:
+        if line.startswith(LOG_PREFIX):
+            print(f"{name}: {line.rstrip()}", flush=True)
+    return process.wait()
+
+def bake_directory(directory, settings, workers=1, object_names=None, save=True, blender=None) -> int:
+    """
+    bake every .blend under directory, one background blender process per file and up to workers at once
+    return the number of files whose process failed
+    """
+    blender = blender or bpy.app.binary_path
+    expression = f"import {__name__} as batch; batch.main()"
+    forwarded = settings.to_args()
+    if object_names:
+        forwarded += ["--objects", *object_names]
+    if not save:
+        forwarded.append("--no-save")
+
+    files = blend_files_in(directory)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        commands = [
+            [
+                blender, "--background", filepath, "--addons", ADDON_MODULE, "--python-exit-code", "1",
+                "--python-expr", expression, "--", *forwarded
+            ]
+            for filepath in files
+        ]
+        codes = list(executor.map(_run_child, commands, files))
+    failed = sum(1 for code in codes if code != 0)
+    print(f"{LOG_PREFIX} {len(files) - failed}/{len(files)} files baked in {time.perf_counter() - start:.2f}s", flush=True)
+    return failed
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="VCT AO batch bake")
+    parser.add_argument("files", nargs="*", help=".blend files to bake, the open file when empty")
+    parser.add_argument("--directory", help="bake every .blend under this directory, one process per file")
+    parser.add_argument("--workers", type=int, default=max((os.cpu_count() or 2) // 2, 1))
+    parser.add_argument("--objects", nargs="*", help="object names, every visible mesh when omitted")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--channel", default='R', choices=['R', 'G', 'B', 'A'])
+    parser.add_argument("--engine", default='BAKE', choices=['BAKE', 'RAYCAST'])
+    parser.add_argument("--uv-index", type=int, default=0)
+    parser.add_argument("--texture-size", default='1024', choices=['256', '512', '1024', '2048', '4096'])
+    parser.add_argument("--adaptive-size", action="store_true", help="texture size becomes the maximum size")
+    parser.add_argument("--texels-per-corner", type=float, default=16.0)
+    parser.add_argument("--no-batch", action="store_true")
+    parser.add_argument("--incremental", action="store_true", help="skip objects unchanged since their last AO bake")
+    parser.add_argument("--filter", default='NEAREST', choices=['NEAREST', 'BILINEAR', 'BOX', 'GAUSSIAN'])
+    parser.add_argument("--taps", type=int, default=3)
+    parser.add_argument("--rays", type=int, default=64)
+    parser.add_argument("--distance", type=float, default=1.0)
+    parser.add_argument("--no-cosine", action="store_true")
+    parser.add_argument("--samples", type=int)
+    parser.add_argument("--device", default='CPU', choices=['CPU', 'GPU'])
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = AOBakeSettings.from_args(args)
+    save = not args.no_save
+    failed = 0
+    if args.directory:
+        failed = bake_directory(args.directory, settings, args.workers, args.objects, save)
+    elif args.files:
+        for filepath in args.files:
+            try:
+                bake_file(filepath, settings, args.objects, save)
+            except Exception as e:
+                print(f"{LOG_PREFIX} {filepath} failed: {e}", flush=True)
+                failed += 1
+    else:
+        #the file given to blender on the command line is already open
+        bake_current_file(settings, args.objects, save)
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,58 @@
+import numpy as np
+
+#---- Color Space ----#
+#whole arrays convert through precomputed tables, values outside [0, 1] fall back to the exact formula
+#and non finite values pass through unchanged.
+
+LUT_SIZE = 65536
+
+def linear_to_srgb(value):
+    if value <= 0.0031308:
+        return 12.92 * value
+    else:
+        return 1.055 * (value ** (1.0 / 2.4)) - 0.055
+
+def srgb_to_linear(value):
+    if value <= 0.04045:
+        return value / 12.92
+    else:
+        return ((value + 0.055) / 1.055) ** 2.4
+
+def linear_to_srgb_formula(values) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(
+        values <= 0.0031308,
+        12.92 * values,
+        1.055 * np.power(np.maximum(values, 0.0031308), 1.0 / 2.4) - 0.055
+    ).astype(np.float32)
+
+def srgb_to_linear_formula(values) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(
+        values <= 0.04045,
+        values / 12.92,
+        np.power((np.maximum(values, 0.04045) + 0.055) / 1.055, 2.4)
+    ).astype(np.float32)
+
+_LUT_INPUTS = np.linspace(0.0, 1.0, LUT_SIZE)
+LINEAR_TO_SRGB_LUT = linear_to_srgb_formula(_LUT_INPUTS)
+SRGB_TO_LINEAR_LUT = srgb_to_linear_formula(_LUT_INPUTS)
+
+def _convert(values, lut, formula) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float32)
+    #one gather per value instead of a pow, nearest entry of a 16 bit table is well below byte precision
+    finite = np.isfinite(values)
+    indices = np.rint(np.clip(np.where(finite, values, 0.0), 0.0, 1.0) * (LUT_SIZE - 1)).astype(np.int32)
+    converted = lut[indices]
+    outside = finite & ((values < 0.0) | (values > 1.0))
+    if outside.any():
+        converted[outside] = formula(values[outside])
+    if not finite.all():
+        converted[~finite] = values[~finite]
+    return converted
+
+def linear_to_srgb_array(values) -> np.ndarray:
+    return _convert(values, LINEAR_TO_SRGB_LUT, linear_to_srgb_formula)
+
+def srgb_to_linear_array(values) -> np.ndarray:
+    return _convert(values, SRGB_TO_LINEAR_LUT, srgb_to_linear_formula)
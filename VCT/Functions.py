@@ -1,6 +1,16 @@
-import bpy, bmesh, mathutils, random, gpu, math
+import bpy, bmesh, mathutils, gpu, math, time, zlib, hashlib, uuid
+import numpy as np
+from .Kernels import (
+    CHANNEL_INDEX,
+    set_channel, scale_channel, invert_channel, swap_channels, fill_color, set_colors, lerp_colors,
+    project_positions, project_to_region,
+    read_attribute_colors, write_attribute_colors, read_bmesh_colors, write_bmesh_colors,
+)
+from .ColorSpace import linear_to_srgb, linear_to_srgb_array
+from .Islands import connected_face_labels, uv_island_labels
+from .Sampling import read_image_pixels, sample_image, corner_footprint_radius, face_uv_areas, adaptive_bake_size
+from .Occlusion import transform_points, transform_normals, build_occluder_tree, vertex_occlusion_chunks
 from gpu_extras.batch import batch_for_shader
-from bpy_extras import view3d_utils 
 
 #---- Utility Functions ----#
 
@@ -56,76 +66,65 @@ def bmesh_to_object(context, bm, mesh):
         mesh.data.update() 
         bm.free()
 
-def linear_to_srgb(value):
-    if value <= 0.0031308:
-        return 12.92 * value
-    else:
-        return 1.055 * (value ** (1.0 / 2.4)) - 0.055
-    
-def linear_color_to_srgb(color):
-    return mathutils.Color((
-        linear_to_srgb(color.r),
-        linear_to_srgb(color.g),
-        linear_to_srgb(color.b)
-    ))
-    
-def lerp_float(a: float, b: float, t: float) -> float:
-    return a + (b - a) * t
-
-def lerp_vector4(a: mathutils.Vector, b: mathutils.Vector, t: float) -> mathutils.Vector:
-    VCTproperties = bpy.context.scene.vct_properties
-    if VCTproperties.Bsrgb:
-        return mathutils.Vector((
-            linear_to_srgb(lerp_float(a[0], b[0], t)),
-            linear_to_srgb(lerp_float(a[1], b[1], t)),
-            linear_to_srgb(lerp_float(a[2], b[2], t)),
-            lerp_float(a[3], b[3], t)
-        ))
-    else:
-        return mathutils.Vector((
-            lerp_float(a[0], b[0], t),
-            lerp_float(a[1], b[1], t),
-            lerp_float(a[2], b[2], t),
-            lerp_float(a[3], b[3], t)
-        ))
-
-
 #------verify color layer , or create one, and set it to active render layer------
 
 COLOR_ATTRIBUTE_NAME = "Color"
 
 def ensure_color_attribute(context, mesh):
+    """
+    return the name of the active color attribute, creating a byte corner one when the mesh has none
+    byte and float colors on the point or corner domain are all used as they are, convert_color_attributes converts them
+    """
     #mesh data is edited in object mode, so any bmesh or layer held for `mesh` is stale after a change
     ca = mesh.data.color_attributes
 
     if ca and ca.active_color is None:
         ca.active_color_index = 0
 
-    needs_create = not ca
-    needs_convert = bool(ca) and (
-        ca.active_color.data_type != 'BYTE_COLOR'
-        or ca.active_color.domain != 'CORNER'
-    )
-    if not (needs_create or needs_convert):
+    if ca:
         return ca.active_color.name, False
 
     wasinedit = context.mode == 'EDIT_MESH'
     if wasinedit:
         bpy.ops.object.mode_set(mode='OBJECT')
     try:
-        if needs_create:
-            ca.active_color = ca.new(name=COLOR_ATTRIBUTE_NAME, type='BYTE_COLOR', domain='CORNER')
-        else:
+        ca.active_color = ca.new(name=COLOR_ATTRIBUTE_NAME, type='BYTE_COLOR', domain='CORNER')
+    finally:
+        if wasinedit:
+            bpy.ops.object.mode_set(mode='EDIT')
+
+    return ca.active_color.name, True
+
+def convert_color_attributes(context, domain='CORNER', data_type='BYTE_COLOR'):
+    """
+    convert the active color attribute of every selected mesh, the only place the tool changes an attribute format
+    """
+    meshes = fetch_mesh_in_context(context)
+    if not meshes:
+        return {'CANCELLED'}
+
+    wasinedit = context.mode == 'EDIT_MESH'
+    if wasinedit:
+        bpy.ops.object.mode_set(mode='OBJECT')
+    previous_active = context.view_layer.objects.active
+    try:
+        for mesh in meshes:
+            active = mesh.data.color_attributes.active_color
+            if active is None or (active.domain == domain and active.data_type == data_type):
+                continue
             #color_attribute_convert only ever touches the active object
-            previous_active = context.view_layer.objects.active
             context.view_layer.objects.active = mesh
-            bpy.ops.geometry.color_attribute_convert(domain='CORNER', data_type='BYTE_COLOR')
-            context.view_layer.objects.active = previous_active
+            bpy.ops.geometry.color_attribute_convert(domain=domain, data_type=data_type)
     finally:
+        context.view_layer.objects.active = previous_active
         if wasinedit:
             bpy.ops.object.mode_set(mode='EDIT')
+    return {'FINISHED'}
 
-    return ca.active_color.name, True
+def bmesh_color_layers(bm, attr):
+    #point colors live on the verts, float colors have their own layer collection
+    elements = bm.verts if attr.domain == 'POINT' else bm.loops
+    return elements.layers.float_color if attr.data_type == 'FLOAT_COLOR' else elements.layers.color
 
 def fetch_color_layer(bm, mesh, context):
     keys, changed = ensure_color_attribute(context, mesh)
@@ -133,110 +132,360 @@ def fetch_color_layer(bm, mesh, context):
         if context.mode != 'EDIT_MESH':
             bm.free()   #standalone bmesh we own, now stale
         bm = bmesh_from_object(context, mesh)   #the edit bmesh was freed by the mode toggle, re-acquire it
-    return bm.loops.layers.color.get(keys), bm
+    return bmesh_color_layers(bm, mesh.data.color_attributes[keys]).get(keys), bm
+
+def fetch_relevant_color_attribute(context, mesh):
+    """
+    return the color attribute an object mode operator writes to (ChannelChecker while inspecting), or None
+    """
+    VCTproperties = context.scene.vct_properties
+    if VCTproperties.inspect_enable:
+        if is_inspected(context, mesh):
+            return mesh.data.color_attributes.get(INSPECT_LAYER_NAME)
+        return None
+    name, _ = ensure_color_attribute(context, mesh)
+    return mesh.data.color_attributes.get(name)
 
 def fetch_relevant_color_layer(bm, mesh, context):
-    VCTproperties = bpy.context.scene.vct_properties
+    VCTproperties = context.scene.vct_properties
     if VCTproperties.inspect_enable:
-        if mesh in Inspect_meshes:
-            return bm.loops.layers.color.get("ChannelChecker"), bm
+        checker = mesh.data.color_attributes.get(INSPECT_LAYER_NAME)
+        if is_inspected(context, mesh) and checker is not None:
+            return bmesh_color_layers(bm, checker).get(INSPECT_LAYER_NAME), bm
         else:
             return None, bm
     else:
         return fetch_color_layer(bm, mesh, context)
 
+def edit_color_elements(mesh, color_layer, loops):
+    """
+    return the bmesh elements holding the colors of loops and whether the layer stores linear floats
+    point colors are read and written through the vertex of each loop
+    """
+    attr = mesh.data.color_attributes[color_layer.name]
+    if attr.domain == 'POINT':
+        loops = [loop.vert for loop in loops]
+    return loops, attr.data_type == 'FLOAT_COLOR'
 
+def corner_kernel(kernel):
+    """
+    flag a kernel whose values are given per corner, point colors run it on a copy gathered to the corners
+    """
+    kernel.per_corner = True
+    return kernel
+
+def vertex_values_kernel(build, vertex_values, corner_vertex_indices):
+    """
+    kernel for values given per vertex, build(values) returning the kernel for one value per row
+    corner colors get the values gathered to the corners, point colors take them as they are, without a round trip
+    """
+    def kernel(colors, mask):
+        build(vertex_values[corner_vertex_indices])(colors, mask)
+    kernel.per_vertex = lambda colors, mask: build(vertex_values)(colors, mask)
+    return kernel
 
-#---- Main Functions ----#
 
-def value_to_channel(value, Echannel, current_color, fillgrayscale=False, apply_srgb=True):
-    VCTproperties = bpy.context.scene.vct_properties
-    if fillgrayscale:
-        return (value, value, value, 1.0)
-    else:
-        #apply_srgb is disabled when the value is derived from what is already stored in the channel
-        if VCTproperties.Bsrgb and apply_srgb:
-            value = linear_to_srgb(value)
-        return {
-            'R': (value, current_color.y, current_color.z, current_color.w),
-            'G': (current_color.x, value, current_color.z, current_color.w),
-            'B': (current_color.x, current_color.y, value, current_color.w),
-            'A': (current_color.x, current_color.y, current_color.z, value),
-        }[Echannel]
+
+#---- Mesh Data Cache ----#
+
+class MeshDataCache:
+    """
+    bulk arrays and bmeshes acquired from each mesh, built lazily once per mesh and kept for the duration of one operator
+    in edit mode the arrays come from mesh.data after a single update_from_editmode, so they follow the edit bmesh order
+    use it as a context manager so every owned bmesh is freed when the operator ends, even on cancel or exception
+    """
+    def __init__(self, context):
+        VCTproperties = context.scene.vct_properties
+        self.context = context
+        self.edit_mode = context.mode == 'EDIT_MESH'
+        self.affect_only_selected = VCTproperties.affect_only_selected
+        self.face_mode = VCTproperties.Bedit_face_mode
+        self.arrays = {}
+        self.bmeshes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.free()
+        return False
+
+    def free(self):
+        #the edit bmesh belongs to blender, only standalone object mode bmeshes are ours to free
+        if not self.edit_mode:
+            for bm in self.bmeshes.values():
+                if bm.is_valid:
+                    bm.free()
+        self.bmeshes.clear()
+        self.arrays.clear()
+
+    def bmesh(self, mesh) -> bmesh.types.BMesh:
+        bm = self.bmeshes.get(mesh)
+        if bm is None or not bm.is_valid:
+            bm = self.bmeshes[mesh] = bmesh_from_object(self.context, mesh)
+        return bm
+
+    def color_layer(self, mesh):
+        """
+        return the relevant loop color layer and the cached bmesh, tracking the bmesh if the layer setup replaced it
+        """
+        color_layer, bm = fetch_relevant_color_layer(self.bmesh(mesh), mesh, self.context)
+        self.bmeshes[mesh] = bm
+        return color_layer, bm
+
+    def _get(self, mesh, key, build):
+        arrays = self.arrays.get(mesh)
+        if arrays is None:
+            if self.edit_mode:
+                mesh.update_from_editmode()   #flush the edit bmesh once so bulk reads are up to date
+            arrays = self.arrays[mesh] = {}
+        if key not in arrays:
+            arrays[key] = build(mesh.data)
+        return arrays[key]
+
+    def corner_count(self, mesh) -> int:
+        return self._get(mesh, "corner_count", lambda data: len(data.loops))
+
+    def corner_vertex_indices(self, mesh) -> np.ndarray:
+        def build(data):
+            indices = np.empty(len(data.loops), dtype=np.int32)
+            data.loops.foreach_get("vertex_index", indices)
+            return indices
+        return self._get(mesh, "corner_vertex_indices", build)
+
+    def face_loop_starts(self, mesh) -> np.ndarray:
+        def build(data):
+            starts = np.empty(len(data.polygons), dtype=np.int32)
+            data.polygons.foreach_get("loop_start", starts)
+            return starts
+        return self._get(mesh, "face_loop_starts", build)
+
+    def face_loop_totals(self, mesh) -> np.ndarray:
+        def build(data):
+            totals = np.empty(len(data.polygons), dtype=np.int32)
+            data.polygons.foreach_get("loop_total", totals)
+            return totals
+        return self._get(mesh, "face_loop_totals", build)
+
+    def corner_face_indices(self, mesh) -> np.ndarray:
+        return self._get(mesh, "corner_face_indices", lambda data: np.repeat(
+            np.arange(len(data.polygons), dtype=np.int32), self.face_loop_totals(mesh)
+        ))
+
+    def vertex_positions(self, mesh) -> np.ndarray:
+        def build(data):
+            positions = np.empty(len(data.vertices) * 3, dtype=np.float32)
+            data.vertices.foreach_get("co", positions)
+            return positions.reshape(-1, 3)
+        return self._get(mesh, "vertex_positions", build)
+
+    def vertex_normals(self, mesh) -> np.ndarray:
+        def build(data):
+            normals = np.empty(len(data.vertices) * 3, dtype=np.float32)
+            data.vertices.foreach_get("normal", normals)
+            return normals.reshape(-1, 3)
+        return self._get(mesh, "vertex_normals", build)
+
+    def triangle_vertex_indices(self, mesh) -> np.ndarray:
+        def build(data):
+            data.calc_loop_triangles()
+            indices = np.empty(len(data.loop_triangles) * 3, dtype=np.int32)
+            data.loop_triangles.foreach_get("vertices", indices)
+            return indices.reshape(-1, 3)
+        return self._get(mesh, "triangle_vertex_indices", build)
+
+    def projected_positions(self, mesh, direction, matrix=None) -> np.ndarray:
+        """
+        vertex positions projected onto direction, shared by every pass of the operator that asks for the same projection
+        """
+        key = ("projection", tuple(direction), None if matrix is None else tuple(map(tuple, matrix)))
+        return self._get(mesh, key, lambda data: project_positions(self.vertex_positions(mesh), direction, matrix))
+
+    def region_positions(self, mesh, region, rv3d) -> np.ndarray:
+        """
+        vertex positions projected to region pixels for the current view, nan for vertices behind it
+        """
+        key = ("region", region.width, region.height, tuple(map(tuple, rv3d.perspective_matrix)), tuple(map(tuple, mesh.matrix_world)))
+        return self._get(mesh, key, lambda data: project_to_region(
+            self.vertex_positions(mesh), rv3d.perspective_matrix, mesh.matrix_world, region.width, region.height
+        ))
+
+    def corner_edge_indices(self, mesh) -> np.ndarray:
+        def build(data):
+            indices = np.empty(len(data.loops), dtype=np.int32)
+            data.loops.foreach_get("edge_index", indices)
+            return indices
+        return self._get(mesh, "corner_edge_indices", build)
+
+    def corner_component_labels(self, mesh) -> np.ndarray:
+        """
+        per corner label of the edge connected piece of the mesh it belongs to
+        """
+        return self._get(mesh, "corner_component_labels", lambda data: connected_face_labels(
+            len(data.polygons), self.corner_face_indices(mesh), self.corner_edge_indices(mesh)
+        )[self.corner_face_indices(mesh)])
+
+    def corner_uvs(self, mesh, uv_layer_name=None) -> np.ndarray:
+        def build(data):
+            uv_layer = data.uv_layers.get(uv_layer_name) if uv_layer_name else data.uv_layers.active
+            if uv_layer is None:
+                raise RuntimeError("No active UV layer")
+            uvs = np.empty(len(data.loops) * 2, dtype=np.float32)
+            uv_layer.data.foreach_get("uv", uvs)
+            return uvs.reshape(-1, 2)
+        return self._get(mesh, ("corner_uvs", uv_layer_name), build)
+
+    def corner_uv_island_labels(self, mesh, uv_layer_name=None, eps=1e-6) -> np.ndarray:
+        """
+        per corner UV island id, see Islands.uv_island_labels
+        """
+        return self._get(mesh, ("corner_uv_island_labels", uv_layer_name, eps), lambda data: uv_island_labels(
+            self.face_loop_starts(mesh), self.face_loop_totals(mesh), self.corner_vertex_indices(mesh),
+            self.corner_edge_indices(mesh), self.corner_uvs(mesh, uv_layer_name), eps
+        ))
+
+    def vertex_selection(self, mesh) -> np.ndarray:
+        def build(data):
+            vert_select = np.empty(len(data.vertices), dtype=bool)
+            data.vertices.foreach_get("select", vert_select)
+            return vert_select
+        return self._get(mesh, "vertex_selection", build)
+
+    def corner_selection_mask(self, mesh):
+        """
+        per corner bool array of what an edit mode operator may touch, None when every corner is affected
+        face select in face mode, vertex select otherwise
+        """
+        if not self.edit_mode or not self.affect_only_selected:
+            return None
+
+        def build(data):
+            if self.face_mode:
+                face_select = np.empty(len(data.polygons), dtype=bool)
+                data.polygons.foreach_get("select", face_select)
+                return np.repeat(face_select, self.face_loop_totals(mesh))
+            return self.vertex_selection(mesh)[self.corner_vertex_indices(mesh)]
+        return self._get(mesh, "corner_selection_mask", build)
+
+    def edit_loops(self, mesh, bm):
+        """
+        return the BMLoops an edit mode operator may touch and their corner indices, in corner order
+        only the faces holding a selected corner are visited
+        """
+        mask = self.corner_selection_mask(mesh)
+        if mask is None:
+            loops = [loop for face in bm.faces for loop in face.loops]
+            return loops, np.arange(len(loops))
+
+        corners = np.flatnonzero(mask)
+        starts = self.face_loop_starts(mesh)
+        totals = self.face_loop_totals(mesh)
+        bm.faces.ensure_lookup_table()
+        loops = []
+        for face_index in np.unique(self.corner_face_indices(mesh)[corners]).tolist():
+            start = starts[face_index]
+            keep = mask[start:start + totals[face_index]].tolist()
+            loops.extend(loop for loop, selected in zip(bm.faces[face_index].loops, keep) if selected)
+        return loops, corners
+
+
+#---- Main Functions ----#
 
 def fill_vertex_color(context, overide_color=None):
     VCTproperties = context.scene.vct_properties
     color = overide_color if overide_color else VCTproperties.fill_color
     if VCTproperties.Bsrgb:
-        alpha = color[3]
-        color = linear_color_to_srgb(mathutils.Color((color[0], color[1], color[2])))
-        color = (color.r, color.g, color.b, alpha)
+        color = (*linear_to_srgb_array(color[:3]).tolist(), color[3])
 
     meshes = fetch_mesh_in_context(context)
     if not meshes:
         return {'CANCELLED'}
 
-    for mesh in meshes: #for each mesh
-        bm = bmesh_from_object(context, mesh) #get the bmesh
-        if VCTproperties.inspect_enable:
-            if mesh in Inspect_meshes:
-                color_layer = bm.loops.layers.color.get("ChannelChecker")
-            else:
-                return {'CANCELLED'}
-        else:
-            color_layer, bm = fetch_color_layer(bm, mesh, context)
+    return apply_channel_kernel(context, lambda colors, mask: fill_color(colors, color, mask))
 
-        for face in bm.faces:
-            for loop in face.loops:
-                if context.mode == 'EDIT_MESH':
-                    if should_affect_loop_editmode(VCTproperties, face, loop):
-                        loop[color_layer] = color
-                else:
-                    loop[color_layer] = color
+def apply_channel_kernel(context, kernel):
+    """
+    run kernel(colors, mask) on the (N,4) corner colors of every mesh in context, then write them back in one call
+    mask is None in object mode, in edit mode it flags the corners the operator is allowed to touch
+    """
+    meshes = fetch_mesh_in_context(context)
+    if not meshes:
+        return {'CANCELLED'}
 
-        bmesh_to_object(context, bm, mesh)
+    with MeshDataCache(context) as cache:
+        for mesh in meshes:
+            apply_kernel_to_mesh(context, mesh, cache, kernel)
     return {'FINISHED'}
 
+def apply_kernel_to_mesh(context, mesh, cache, kernel):
+    if context.mode != 'EDIT_MESH':
+        attr = fetch_relevant_color_attribute(context, mesh)
+        if attr is None:
+            return
+        colors = read_attribute_colors(attr)
+        if attr.domain == 'POINT' and hasattr(kernel, "per_vertex"):
+            kernel.per_vertex(colors, None)
+        elif attr.domain == 'POINT' and getattr(kernel, "per_corner", False):
+            #per corner values are gathered to the corners and folded back, the last corner of a vertex wins
+            corner_vertices = cache.corner_vertex_indices(mesh)
+            corner_colors = colors[corner_vertices]
+            kernel(corner_colors, None)
+            colors[corner_vertices] = corner_colors
+        else:
+            #point colors run constant kernels on one row per vertex, far fewer than corners
+            kernel(colors, None)
+        write_attribute_colors(attr, colors)
+        mesh.data.update()
+    else:
+        color_layer, bm = cache.color_layer(mesh)
+        if color_layer is None:
+            return
+        #only the corners the selection allows are read from and written to the edit bmesh
+        loops, corners = cache.edit_loops(mesh, bm)
+        if not loops:
+            return
+        elements, linear = edit_color_elements(mesh, color_layer, loops)
+        colors = np.zeros((cache.corner_count(mesh), 4), dtype=np.float32)
+        colors[corners] = read_bmesh_colors(elements, color_layer, linear)
+        kernel(colors, cache.corner_selection_mask(mesh))
+        write_bmesh_colors(elements, color_layer, colors[corners], linear)
+        bmesh_to_object(context, bm, mesh)
+
 def fill_channel(context):
     VCTproperties = context.scene.vct_properties
     Echannel = VCTproperties.fill_1channel
     value = VCTproperties.fill_1channel_value
     if VCTproperties.Bsrgb:
         value = linear_to_srgb(value)
-    meshes = fetch_mesh_in_context(context)
-    if not meshes: 
-        return {'CANCELLED'}
-    for mesh in meshes:
-        bm = bmesh_from_object(context, mesh)
-        color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-
-        for face in bm.faces:
-            for loop in face.loops:
-                if context.mode == 'EDIT_MESH':
-                    if loop.vert.select or not VCTproperties.affect_only_selected:
-                        loop[color_layer] = value_to_channel(value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
-                else:
-                    loop[color_layer] = value_to_channel(value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
-        bmesh_to_object(context, bm, mesh)
+    grayscale = VCTproperties.inspect_enable
 
-    return {'FINISHED'}
+    return apply_channel_kernel(context, lambda colors, mask: set_channel(colors, Echannel, value, mask, grayscale))
 
-def should_affect_loop_editmode(vct_props, face, loop):
-    if not vct_props.affect_only_selected:
-        return True
+def channel_values_kernel(VCTproperties, Echannel, corner_values):
+    """
+    return a channel kernel writing one value per corner into Echannel, sRGB encoded
+    the inspect layer holds the stored encoding of the channel, so it is encoded the same way
+    """
+    grayscale = VCTproperties.inspect_enable
+    if VCTproperties.Bsrgb:
+        corner_values = linear_to_srgb_array(corner_values)
+    kernel = lambda colors, mask: set_channel(colors, Echannel, corner_values, mask, grayscale)
+    #a single value is the same on every row, point colors run it on the vertices directly
+    return corner_kernel(kernel) if np.ndim(corner_values) else kernel
 
-    if vct_props.Bedit_face_mode:
-        return face.select
-    else:
-        return loop.vert.select
+def gradient_kernel(VCTproperties, corner_values):
+    """
+    return a channel kernel writing one gradient value per corner, as a channel value or a color ramp
+    """
+    if VCTproperties.Bcolor_gradient and not VCTproperties.inspect_enable:
+        start = tuple(VCTproperties.gradient_color_start)
+        end = tuple(VCTproperties.gradient_color_end)
+        return corner_kernel(lambda colors, mask: lerp_colors(colors, start, end, corner_values, mask, srgb=VCTproperties.Bsrgb))
+    return channel_values_kernel(VCTproperties, VCTproperties.gradient_channel, corner_values)
 
 def fill_gradient(context):
     VCTproperties = context.scene.vct_properties
-    Echannel = VCTproperties.gradient_channel
-    use_global = VCTproperties.gradient_global
     Edirection = VCTproperties.gradient_direction
-    InvertGradient = VCTproperties.gradient_invert
-    ColorGradient = VCTproperties.Bcolor_gradient
     direction = {
         'X': (1, 0, 0),
         'Y': (0, 1, 0),
@@ -246,6 +495,21 @@ def fill_gradient(context):
     if not meshes: 
         return {'CANCELLED'}
 
+    with MeshDataCache(context) as cache:
+        return _fill_gradient_meshes(context, meshes, cache, direction)
+
+def _fill_gradient_meshes(context, meshes, cache, direction):
+    VCTproperties = context.scene.vct_properties
+    use_global = VCTproperties.gradient_global
+    InvertGradient = VCTproperties.gradient_invert
+    restrict_range = context.mode == 'EDIT_MESH' and VCTproperties.affect_only_selected
+
+    def gradient_range(mesh, projections):
+        #in edit mode the gradient only spans the selected vertices
+        if restrict_range:
+            return projections[cache.vertex_selection(mesh)]
+        return projections
+
     if use_global:  # case using global gradient
 
         if VCTproperties.gradient_WS_direction:
@@ -260,46 +524,23 @@ def fill_gradient(context):
         global_min = float('inf')
         global_max = float('-inf')
 
-        # Scan all meshes to find global min/max projections in WORLD space
+        # Scan all meshes to find global min/max projections in WORLD space, the fill pass reuses them
         for mesh in meshes:
-            bm = bmesh_from_object(context, mesh)
-
-            if context.mode == 'EDIT_MESH':
-                verts_iter = (v for v in bm.verts if v.select or not VCTproperties.affect_only_selected)
-            else:
-                verts_iter = bm.verts
-
-            mw = mesh.matrix_world
-            for v in verts_iter:
-                proj = (mw @ v.co).dot(worldDirection)
-                if proj < global_min: global_min = proj
-                if proj > global_max: global_max = proj
+            in_range = gradient_range(mesh, cache.projected_positions(mesh, worldDirection, mesh.matrix_world))
+            if in_range.size:
+                global_min = min(global_min, float(in_range.min()))
+                global_max = max(global_max, float(in_range.max()))
 
+        if global_min == float('inf'):
+            return {'CANCELLED'}
         if not (global_max > global_min):
             global_max = global_min + 1e-6
       
     for mesh in meshes:
-        # get bm mesh and loop color layer
-        bm = bmesh_from_object(context, mesh)
-        if VCTproperties.inspect_enable:
-            if mesh in Inspect_meshes:
-                color_layer = bm.loops.layers.color.get("ChannelChecker")
-            else:
-                return {'CANCELLED'}
-        else:
-            color_layer, bm = fetch_color_layer(bm, mesh, context)
-        
         if use_global:
-            mw = mesh.matrix_world
-            for face in bm.faces:
-                for loop in face.loops:
-                    if context.mode == 'EDIT_MESH' and VCTproperties.affect_only_selected and not loop.vert.select:
-                        continue
-                    projection_value = (mw @ loop.vert.co).dot(worldDirection)
-                    value = (projection_value - global_min) / (global_max - global_min)
-                    if InvertGradient:
-                        value = 1.0 - value
-                    loop[color_layer] = value_to_channel(value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
+            #same key as the min/max pass, so the projection is not computed twice
+            projections = cache.projected_positions(mesh, worldDirection, mesh.matrix_world)
+            min_coord, max_coord = global_min, global_max
         else:
             # calculate local direction if needed
             if VCTproperties.gradient_WS_direction:
@@ -315,152 +556,159 @@ def fill_gradient(context):
             else:
                 LocalDirection = mathutils.Vector(direction)
 
-            # gather all vertex coordinates in the chosen direction
-            if not context.mode == 'EDIT_MESH':
-                coords_local = [v.co.dot(LocalDirection) for v in bm.verts]
-            else:
-                coords_local = [v.co.dot(LocalDirection) for v in bm.verts if v.select or not VCTproperties.affect_only_selected]
-
-            if not coords_local:
-                bmesh_to_object(context, bm, mesh)
+            # project all vertex coordinates in the chosen direction at once
+            projections = cache.projected_positions(mesh, LocalDirection)
+            in_range = gradient_range(mesh, projections)
+            if not in_range.size:
                 continue
 
-            min_coord = min(coords_local)
-            max_coord = max(coords_local) or (min_coord + 1e-6)
-
-            if min_coord == max_coord:
-                max_coord += 1e-6  # Prevent division by zero
-
-            # fill gradient
-            for face in bm.faces:
-                for loop in face.loops:
-                    projection_value = loop.vert.co.dot(LocalDirection)
-                    value = (projection_value - min_coord) / (max_coord - min_coord)
-                    if InvertGradient:
-                        value = 1.0 - value
-
-                    if context.mode == 'EDIT_MESH' and VCTproperties.affect_only_selected:
-                        if should_affect_loop_editmode(VCTproperties, face, loop):
-                            if ColorGradient and not VCTproperties.inspect_enable:
-                                loop[color_layer] = lerp_vector4(VCTproperties.gradient_color_start, VCTproperties.gradient_color_end, value)
-                            else:
-                                loop[color_layer] = value_to_channel(value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
-                    else:
-                        if ColorGradient and not VCTproperties.inspect_enable:
-                            loop[color_layer] = lerp_vector4(VCTproperties.gradient_color_start, VCTproperties.gradient_color_end, value)
-                        else:
-                            loop[color_layer] = value_to_channel(value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
+            min_coord = float(in_range.min())
+            max_coord = float(in_range.max())
+            if not (max_coord > min_coord):
+                max_coord = min_coord + 1e-6  # Prevent division by zero
 
-        bmesh_to_object(context, bm, mesh)
+        values = (projections - min_coord) / (max_coord - min_coord)
+        if InvertGradient:
+            values = 1.0 - values
+
+        #per vertex values, scattered to the corners through the loop vertex indices unless the colors are per vertex
+        kernel = vertex_values_kernel(lambda values: gradient_kernel(VCTproperties, values), values, cache.corner_vertex_indices(mesh))
+        apply_kernel_to_mesh(context, mesh, cache, kernel)
     return {'FINISHED'}
 
 
 
 
+def random_generator(VCTproperties, *keys) -> np.random.Generator:
+    """
+    return a fresh generator, or a seeded one when a seed is set
+    keys (object names) are mixed into the seed so every mesh gets its own stream, stable across sessions and exports
+    """
+    if not VCTproperties.random_use_seed:
+        return np.random.default_rng()
+    return np.random.default_rng([VCTproperties.random_seed] + [zlib.crc32(key.encode()) for key in keys])
+
+def random_label_values(rng, count, normalize=False) -> np.ndarray:
+    """
+    count random values in one shot, or evenly spaced values from 0 to 1 in a random order when normalized
+    """
+    if normalize:
+        return (rng.permutation(count) / max(count - 1, 1)).astype(np.float32)
+    return rng.random(count, dtype=np.float32)
+
 def fill_random(context):
     VCTproperties = context.scene.vct_properties
     Echannel = VCTproperties.random_channel
     meshes = fetch_mesh_in_context(context)
     if not meshes: 
         return {'CANCELLED'}
-    
-    #final writing to channel function
-    def write_random_value_to_loops(loops, rand_value):
-        for loop in loops:
-            if context.mode == 'EDIT_MESH':
-                if should_affect_loop_editmode(VCTproperties, loop.face, loop):
-                    loop[color_layer] = value_to_channel(rand_value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
-            else:
-                loop[color_layer] = value_to_channel(rand_value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
 
     random_per_connected = VCTproperties.random_per_connected
     random_per_uv_island = VCTproperties.random_per_uv_island
     random_per_vertex = VCTproperties.random_per_vertex
 
     if random_per_vertex:
-        for mesh in meshes:
-            bm = bmesh_from_object(context, mesh)
-            color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-            verts = list(bm.verts)
-            random_values = [0.0] * len(verts)
-
-            if VCTproperties.random_normalize:
-                step = 1.0 / max(len(verts) - 1, 1)
-                random_values = [i * step for i in range(len(verts))]
-                random.shuffle(random_values)
-
-            for vert, rand_value in zip(verts, random_values):
-                if VCTproperties.random_normalize:
-                    pass  # Use precomputed normalized value
-                else:
-                    rand_value = random.random()
-                write_random_value_to_loops(vert.link_loops, rand_value)
-            bmesh_to_object(context, bm, mesh)
-        return {'FINISHED'}
+        return fill_random_per_label(context, meshes, lambda cache, mesh: cache.corner_vertex_indices(mesh), per_vertex=True)
     if not random_per_connected and not random_per_uv_island:
-        random_values = [0.0] * len(meshes)
-
-        if VCTproperties.random_normalize:
-            step = 1.0 / max(len(meshes) - 1, 1)
-            random_values = [i * step for i in range(len(meshes))]
-            random.shuffle(random_values)
-
-        for mesh, rand_value in zip(meshes, random_values):
-            bm = bmesh_from_object(context, mesh)
-            color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-            if VCTproperties.random_normalize:
-                pass  # Use precomputed normalized value
-            else:
-                rand_value = random.random()
-
-            for face in bm.faces:
-                write_random_value_to_loops(face.loops, rand_value)
-            bmesh_to_object(context, bm, mesh)
+        #one value per object, handed out in name order so a seed gives every object the same value each time
+        ordered = sorted(meshes, key=lambda mesh: mesh.name)
+        random_values = random_label_values(random_generator(VCTproperties), len(ordered), VCTproperties.random_normalize)
+        with MeshDataCache(context) as cache:
+            for mesh, rand_value in zip(ordered, random_values):
+                apply_kernel_to_mesh(context, mesh, cache, channel_values_kernel(VCTproperties, Echannel, rand_value))
         return {'FINISHED'}
     if random_per_connected:
-        for mesh in meshes:
-            bm = bmesh_from_object(context, mesh)
-            color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-            connected_loops_list = fetch_connected_loops(bm)
-            random_values = [0.0] * len(connected_loops_list)
-
-            if VCTproperties.random_normalize:
-                step = 1.0 / max(len(connected_loops_list) - 1, 1)
-                random_values = [i * step for i in range(len(connected_loops_list))]
-                random.shuffle(random_values)
-            
-            for loops, rand_value in zip(connected_loops_list, random_values):
-                if VCTproperties.random_normalize:
-                    pass  # Use precomputed normalized value
-                else:
-                    rand_value = random.random()
-                write_random_value_to_loops(loops, rand_value)
-            bmesh_to_object(context, bm, mesh)
-        return {'FINISHED'}
+        return fill_random_per_label(context, meshes, lambda cache, mesh: cache.corner_component_labels(mesh))
     if random_per_uv_island:
+        return fill_random_per_label(context, meshes, lambda cache, mesh: cache.corner_uv_island_labels(mesh))
+
+def fill_random_per_label(context, meshes, corner_labels, per_vertex=False):
+    """
+    fill one random value per label, corner_labels(cache, mesh) returning the per corner label array
+    per_vertex labels are the vertex indices, point colors then take the values without going through the corners
+    """
+    VCTproperties = context.scene.vct_properties
+    Echannel = VCTproperties.random_channel
+    with MeshDataCache(context) as cache:
         for mesh in meshes:
-            bm = bmesh_from_object(context, mesh)
-            color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-            uv_island_loops_list = fetch_uv_island_loops(bm)
-            random_values = [0.0] * len(uv_island_loops_list)
-
-            if VCTproperties.random_normalize:
-                step = 1.0 / max(len(uv_island_loops_list) - 1, 1)
-                random_values = [i * step for i in range(len(uv_island_loops_list))]
-                random.shuffle(random_values)
-            
-            for loops, rand_value in zip(uv_island_loops_list, random_values):
-                if VCTproperties.random_normalize:
-                    pass  # Use precomputed normalized value
-                else:
-                    rand_value = random.random()
-                write_random_value_to_loops(loops, rand_value)
-            bmesh_to_object(context, bm, mesh)
-        return {'FINISHED'}
-    
+            #one value per label, gathered to the corners in a single step
+            labels = corner_labels(cache, mesh)
+            label_count = int(labels.max()) + 1 if labels.size else 0
+            if per_vertex:
+                #loose vertices have no corner but still a row in point colors
+                label_count = max(label_count, len(mesh.data.vertices))
+            random_values = random_label_values(random_generator(VCTproperties, mesh.name), label_count, VCTproperties.random_normalize)
+            if per_vertex:
+                kernel = vertex_values_kernel(lambda values: channel_values_kernel(VCTproperties, Echannel, values), random_values, labels)
+            else:
+                kernel = channel_values_kernel(VCTproperties, Echannel, random_values[labels])
+            apply_kernel_to_mesh(context, mesh, cache, kernel)
+    return {'FINISHED'}
+
 
+#---- Inspect ----#
+#the inspected objects live in scene.vct_properties.inspect_objects, so undo, save and addon reload keep them.
+#objects are looked up by session_uid, which survives undo and renames, through an index rebuilt lazily.
 
-Inspect_meshes = set() #container of meshes being inspected
+Inspect_snapshots = {} #original colors of every inspected mesh by session_uid, taken on entry
+_inspect_index = {"key": None, "uids": frozenset()}
+
+INSPECT_LAYER_NAME = "ChannelChecker"
+
+def inspected_object_uids(scene) -> frozenset:
+    VCTproperties = scene.vct_properties
+    #a new token is written with every change, the scene session_uid changes when a file is loaded
+    key = (scene.session_uid, VCTproperties.inspect_token)
+    if _inspect_index["key"] != key:
+        _inspect_index["uids"] = frozenset(
+            item.obj.session_uid for item in VCTproperties.inspect_objects if item.obj is not None
+        )
+        _inspect_index["key"] = key
+    return _inspect_index["uids"]
+
+def is_inspected(context, mesh) -> bool:
+    return mesh.session_uid in inspected_object_uids(context.scene)
+
+def inspected_items(context) -> list:
+    #deleted objects leave an empty pointer behind, they are simply skipped
+    return [item for item in context.scene.vct_properties.inspect_objects if item.obj is not None and item.obj.type == 'MESH']
+
+def set_inspected_objects(context, meshes, attribute_names=None):
+    VCTproperties = context.scene.vct_properties
+    VCTproperties.inspect_objects.clear()
+    for mesh in meshes:
+        item = VCTproperties.inspect_objects.add()
+        item.obj = mesh
+        item.attribute_name = (attribute_names or {}).get(mesh, "")
+    VCTproperties.inspect_token = uuid.uuid4().hex
+
+def snapshot_colors(attr, colors) -> np.ndarray:
+    #byte colors only hold 8 bits per channel, the snapshot keeps them exactly at a quarter of the float size
+    if attr.data_type == 'BYTE_COLOR':
+        return np.round(colors * 255.0).astype(np.uint8)
+    return colors.copy()
+
+def snapshot_to_colors(snapshot) -> np.ndarray:
+    if snapshot.dtype == np.uint8:
+        return snapshot.astype(np.float32) / 255.0
+    return snapshot.copy()
+
+def changed_gray_corners(snapshot, Echannel, gray) -> np.ndarray:
+    """
+    bool mask of the corners whose gray value differs from the snapshot, compared at the precision of the snapshot
+    """
+    column = snapshot[:, CHANNEL_INDEX[Echannel]]
+    if snapshot.dtype == np.uint8:
+        return np.round(gray * 255.0).astype(np.uint8) != column
+    #float colors go through an sRGB encode and decode on the way, leave room for its rounding
+    return np.abs(gray - column) > 1e-5
+
+def set_object_mode_for_inspect(context) -> bool:
+    #attribute data is only reachable in object mode, one toggle flushes every edit bmesh for all the bulk calls
+    wasinedit = context.mode == 'EDIT_MESH'
+    if wasinedit:
+        bpy.ops.object.mode_set(mode='OBJECT')
+    return wasinedit
 
 def inspect_color_channel(context):
 
@@ -475,82 +723,90 @@ def inspect_color_channel(context):
     if not meshes: 
         return {'CANCELLED'}
     
-    Inspect_meshes.clear()
-    Inspect_meshes.update(meshes)
+    Inspect_snapshots.clear()
 
-    if not VCTproperties.inspect_enable:
+    attribute_names = {}
+    wasinedit = set_object_mode_for_inspect(context)
+    try:
         for mesh in meshes:
-            bm = bmesh_from_object(context, mesh)
-            color_layer, bm = fetch_color_layer(bm, mesh, context)
-
-            bm_channel_checker = bm.loops.layers.color.new("ChannelChecker")
-
-            for face in bm.faces:
-                for loop in face.loops:
-                    value = getattr(loop[color_layer], {'R': 'x', 'G': 'y', 'B': 'z', 'A': 'w'}[Echannel])
-                    loop[bm_channel_checker] = (value, value, value, 1.0)
-
-            bmesh_to_object(context, bm, mesh)
-            mesh.data.color_attributes.active_color = mesh.data.color_attributes["ChannelChecker"] 
-        VCTproperties.inspect_enable = True
-        return {'FINISHED'}
-
+            name, _ = ensure_color_attribute(context, mesh)
+            ca = mesh.data.color_attributes
+            colors = read_attribute_colors(ca[name])
+            if ca.get(INSPECT_LAYER_NAME) is None:
+                ca.new(name=INSPECT_LAYER_NAME, type=ca[name].data_type, domain=ca[name].domain)
+
+            #the inspected column broadcast to gray in one write, the original attribute is never touched
+            gray = np.empty_like(colors)
+            set_channel(gray, Echannel, colors[:, CHANNEL_INDEX[Echannel]], grayscale=True)
+            write_attribute_colors(ca[INSPECT_LAYER_NAME], gray)
+            Inspect_snapshots[mesh.session_uid] = snapshot_colors(ca[name], colors)
+            attribute_names[mesh] = name
+
+            ca.active_color = ca[INSPECT_LAYER_NAME]
+            mesh.data.update()
+    finally:
+        if wasinedit:
+            bpy.ops.object.mode_set(mode='EDIT')
+    set_inspected_objects(context, meshes, attribute_names)
+    VCTproperties.inspect_enable = True
+    return {'FINISHED'}
 
+def original_attribute_name(mesh, attribute_name):
+    """
+    name of the attribute the inspector reads from, the recorded one or else the first that is not ChannelChecker
+    """
+    ca = mesh.data.color_attributes
+    if attribute_name and ca.get(attribute_name) is not None:
+        return attribute_name
+    for attr in ca:
+        if attr.name != INSPECT_LAYER_NAME:
+            return attr.name
+    return None
 
 def remove_inspector(context, keep_data=True):
     VCTproperties = context.scene.vct_properties
+    Echannel = VCTproperties.inspect_channel
 
-    for mesh in Inspect_meshes:
-        if not keep_data:
-            attr = mesh.data.color_attributes.get("ChannelChecker")
-            if attr:
-                mesh.data.color_attributes.remove(attr)
-            bm = bmesh_from_object(context, mesh)
-            color_layer, bm = fetch_color_layer(bm, mesh, context)
-            bmesh_to_object(context, bm, mesh)
-
-        else:
-            bm = bmesh_from_object(context, mesh)
-            check_color_layer = bm.loops.layers.color.get("ChannelChecker")
-
-            # Guard: if the layer isn't reachable as a loop color layer, bail cleanly
-            if check_color_layer is None:
-                bmesh_to_object(context, bm, mesh)
-                attr = mesh.data.color_attributes.get("ChannelChecker")
-                if attr:
-                    mesh.data.color_attributes.remove(attr)
+    wasinedit = set_object_mode_for_inspect(context)
+    try:
+        for item in inspected_items(context):
+            mesh = item.obj
+            ca = mesh.data.color_attributes
+            checker = ca.get(INSPECT_LAYER_NAME)
+            if checker is None:
                 continue
-
-            # Find the original layer — anything that is NOT ChannelChecker
-            original_layer = None
-            for name in bm.loops.layers.color.keys():
-                if name != "ChannelChecker":
-                    original_layer = bm.loops.layers.color.get(name)
-                    break
-            if original_layer is None:
-                original_layer = bm.loops.layers.color.verify()
-
-            original_layer_name = original_layer.name
-
-            for face in bm.faces:
-                for loop in face.loops:
-                    value = loop[check_color_layer].x  # grayscale R=G=B
-                    loop[original_layer] = value_to_channel(
-                        value,
-                        VCTproperties.inspect_channel,
-                        loop[original_layer],
-                        fillgrayscale=False
-                    )
-
-            bm.loops.layers.color.remove(check_color_layer)
-            bmesh_to_object(context, bm, mesh)
-
-            restored = mesh.data.color_attributes.get(original_layer_name)
-            if restored:
-                mesh.data.color_attributes.active_color = restored
+            name = original_attribute_name(mesh, item.attribute_name)
+
+            if keep_data and name is not None:
+                #after an addon reload or file load there is no snapshot, the original attribute is read instead
+                snapshot = Inspect_snapshots.get(mesh.session_uid)
+                gray = read_attribute_colors(checker)[:, 0]
+                if snapshot is not None and len(snapshot) == len(gray):
+                    #the inspected column of the snapshot is the gray view as it was on entry
+                    changed = changed_gray_corners(snapshot, Echannel, gray)
+                    if changed.any():
+                        colors = snapshot_to_colors(snapshot)
+                        set_channel(colors, Echannel, gray, changed)
+                        write_attribute_colors(ca[name], colors)
+                else:
+                    colors = read_attribute_colors(ca[name])
+                    #the gray values are stored as is, only the inspected column of the original changes
+                    set_channel(colors, Echannel, gray)
+                    write_attribute_colors(ca[name], colors)
+
+            ca.remove(ca[INSPECT_LAYER_NAME])
+            if name is not None:
+                ca.active_color = ca[name]
+            else:
+                ensure_color_attribute(context, mesh)
+            mesh.data.update()
+    finally:
+        if wasinedit:
+            bpy.ops.object.mode_set(mode='EDIT')
 
     VCTproperties.inspect_enable = False
-    Inspect_meshes.clear()
+    set_inspected_objects(context, [])
+    Inspect_snapshots.clear()
 
 def random_fill_per_connect_component(context):
     VCTproperties = context.scene.vct_properties
@@ -559,177 +815,24 @@ def random_fill_per_connect_component(context):
     if not meshes: 
         return {'CANCELLED'}
 
-def fetch_connected_loops(bm):
-    visited = set()
-    loops_list = []
-
-    for face in bm.faces:
-        for loop in face.loops:
-            if loop.index in visited:
-                continue
-
-            stack = [loop]
-            component = []
-
-            while stack:
-                current = stack.pop()
-                if current.index in visited:
-                    continue
-
-                visited.add(current.index)
-                component.append(current)
-
-                # 1) Walk around the same face
-                next_loop = current.link_loop_next
-                prev_loop = current.link_loop_prev
-                if next_loop.index not in visited:
-                    stack.append(next_loop)
-                if prev_loop.index not in visited:
-                    stack.append(prev_loop)
-
-                # 2) Cross the shared edge to neighbouring face(s)
-                radial_next = current.link_loop_radial_next
-                radial_prev = current.link_loop_radial_prev
-                if radial_next is not None and radial_next is not current and radial_next.index not in visited:
-                    stack.append(radial_next)
-                if radial_prev is not None and radial_prev is not current and radial_prev.index not in visited:
-                    stack.append(radial_prev)
-
-            loops_list.append(component)
-
-    return loops_list
-
-
-def fetch_uv_island_loops(bm, uv_layer=None, eps=1e-6):
-    if uv_layer is None:
-        uv_layer = bm.loops.layers.uv.active
-        if uv_layer is None:
-            raise RuntimeError("No active UV layer")
-
-    visited = set()       # store visited FACE indices
-    loops_list = []       # list of components; each component is a list of BMLoop
-
-    # helper to compare two (u, v) with tolerance
-    def uv_equal(uv1, uv2):
-        du = uv1.x - uv2.x
-        dv = uv1.y - uv2.y
-        return (du * du + dv * dv) <= (eps * eps)
-
-    for face in bm.faces:
-        if face.index in visited:
-            continue
-
-        stack = [face]
-        faces_component = []
-
-        while stack:
-            f = stack.pop()
-            if f.index in visited:
-                continue
-
-            visited.add(f.index)
-            faces_component.append(f)
-
-            # map: vertex -> loop on this face (fast UV lookup per vertex)
-            f_v2l = {l.vert: l for l in f.loops}
-
-            # try to cross each boundary edge if UVs are welded
-            for l in f.loops:
-                e = l.edge
-
-                # find the other face(s) around this edge
-                for el in e.link_loops:
-                    of = el.face
-                    if of is f:
-                        continue  # same face
-
-                    # need UVs at both edge vertices on both faces
-                    vA, vB = e.verts[0], e.verts[1]
-
-                    # loops on current face for vA and vB
-                    la = f_v2l.get(vA)
-                    lb = f_v2l.get(vB)
-                    if la is None or lb is None:
-                        continue  # should not happen, but be safe
-
-                    uvA_cur = la[uv_layer].uv
-                    uvB_cur = lb[uv_layer].uv
-
-                    # loops on other face for vA and vB
-                    of_v2l = {ol.vert: ol for ol in of.loops}
-                    ola = of_v2l.get(vA)
-                    olb = of_v2l.get(vB)
-                    if ola is None or olb is None:
-                        continue
-
-                    uvA_other = ola[uv_layer].uv
-                    uvB_other = olb[uv_layer].uv
-
-                    # cross only if both endpoints have identical UVs
-                    if uv_equal(uvA_cur, uvA_other) and uv_equal(uvB_cur, uvB_other):
-                        if of.index not in visited:
-                            stack.append(of)
-
-        # convert the collected faces into loops for this UV island
-        component = []
-        for f in faces_component:
-            component.extend(list(f.loops))
-
-        loops_list.append(component)
-
-    return loops_list
-
 def clear_channel(context, value):
     VCTproperties = context.scene.vct_properties
     Echannel = VCTproperties.clear_channel
-    meshes = fetch_mesh_in_context(context)
-    if not meshes:
-        return {'CANCELLED'}
-    for mesh in meshes:
-        bm = bmesh_from_object(context, mesh)
-        color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-
-        for face in bm.faces:
-            for loop in face.loops:
-                if context.mode == 'EDIT_MESH':
-                    if should_affect_loop_editmode(VCTproperties, face, loop):
-                        loop[color_layer] = value_to_channel(value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
-                else:
-                    loop[color_layer] = value_to_channel(value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
-        bmesh_to_object(context, bm, mesh)
-    return {'FINISHED'}
+    grayscale = VCTproperties.inspect_enable
+    if VCTproperties.Bsrgb:
+        value = linear_to_srgb(value)
+
+    return apply_channel_kernel(context, lambda colors, mask: set_channel(colors, Echannel, value, mask, grayscale))
 
 def bias_channel(context):
     VCTproperties = context.scene.vct_properties
     Echannel = VCTproperties.clear_channel
     factor = VCTproperties.bias_percent / 100.0
-    meshes = fetch_mesh_in_context(context)
-    if not meshes:
-        return {'CANCELLED'}
-
-    #the inspector layer is grayscale, the value always lives in x
-    component = 'x' if VCTproperties.inspect_enable else {'R': 'x', 'G': 'y', 'B': 'z', 'A': 'w'}[Echannel]
+    grayscale = VCTproperties.inspect_enable
+    #stored values are sRGB encoded, the inspect layer included, the bias applies to the linear value like every fill writes it
+    srgb = VCTproperties.Bsrgb
 
-    def biased_value(loop_color):
-        return min(max(getattr(loop_color, component) * factor, 0.0), 1.0)
-
-    for mesh in meshes:
-        bm = bmesh_from_object(context, mesh)
-        color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-
-        for face in bm.faces:
-            for loop in face.loops:
-                if context.mode == 'EDIT_MESH' and not should_affect_loop_editmode(VCTproperties, face, loop):
-                    continue
-                loop[color_layer] = value_to_channel(
-                    biased_value(loop[color_layer]),
-                    Echannel,
-                    loop[color_layer],
-                    fillgrayscale=True if VCTproperties.inspect_enable else False,
-                    apply_srgb=False
-                )
-        bmesh_to_object(context, bm, mesh)
-    return {'FINISHED'}
+    return apply_channel_kernel(context, lambda colors, mask: scale_channel(colors, Echannel, factor, mask, grayscale, srgb))
 
 def switch_channel(context):
     VCTproperties = context.scene.vct_properties
@@ -737,247 +840,725 @@ def switch_channel(context):
     Echannel_target = VCTproperties.switch_target_channel
     if Echannel_source == Echannel_target:
         return {'CANCELLED'}
-    
-    def switch_values(loop_color):
-        # coerce to a plain tuple
-        try:
-            r, g, b, a = loop_color.x, loop_color.y, loop_color.z, loop_color.w
-        except AttributeError:
-            r, g, b, a = loop_color
 
-        vals = {'R': r, 'G': g, 'B': b, 'A': a}
-        vals[Echannel_source], vals[Echannel_target] = vals[Echannel_target], vals[Echannel_source]
-        return (vals['R'], vals['G'], vals['B'], vals['A'])
-
-    meshes = fetch_mesh_in_context(context)
-    if not meshes:
-        return {'CANCELLED'}
-    for mesh in meshes:
-        bm = bmesh_from_object(context, mesh)
-        color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-
-        for face in bm.faces:
-            for loop in face.loops:
-                if context.mode == 'EDIT_MESH':
-                    if should_affect_loop_editmode(VCTproperties, face, loop):
-                        loop[color_layer] = switch_values(loop[color_layer])
-                else:
-                    loop[color_layer] = switch_values(loop[color_layer])
-
-        bmesh_to_object(context, bm, mesh)
-    return {'FINISHED'}
+    return apply_channel_kernel(context, lambda colors, mask: swap_channels(colors, Echannel_source, Echannel_target, mask))
 
 
-def bake_ao_to_vertex_color(context):
-    scene = context.scene
-    VCTproperties = scene.vct_properties
-    texture_size_map = {
-        '256': 256, '512': 512, '1024': 1024, '2048': 2048, '4096': 4096,
-    }[VCTproperties.ao_texture_size]
-    Echannel = VCTproperties.ao_vertex_channel
-    fill_grayscale = True if VCTproperties.inspect_enable else False
+def create_ao_bake_resources(size):
+    """
+    return a temp image and a material whose active Image Texture node targets it, ready for an AO bake
+    """
+    temp_image = bpy.data.images.new(
+        "AO_Temp", width=size, height=size, alpha=False
+    )
+    temp_material = bpy.data.materials.new(name="AO_Temp_Material")
+    temp_material.use_nodes = True
+    nt = temp_material.node_tree
+
+    # Ensure there is at least one output so the node tree is valid (defensive)
+    if not any(n.type == 'OUTPUT_MATERIAL' for n in nt.nodes):
+        out = nt.nodes.new("ShaderNodeOutputMaterial")
+        out.location = (300, 0)
+
+    tex_node = nt.nodes.new("ShaderNodeTexImage")
+    tex_node.image = temp_image
+    # Important: make the image node the active one for baking
+    for n in nt.nodes: n.select = False
+    tex_node.select = True
+    nt.nodes.active = tex_node
+    return temp_image, temp_material
+
+def remove_ao_bake_resources(temp_image, temp_material):
+    # Remove temp datablocks if not used elsewhere
+    try:
+        if temp_material and temp_material.users == 0:
+            bpy.data.materials.remove(temp_material)
+    except Exception:
+        pass
+    try:
+        if temp_image and temp_image.users == 0:
+            bpy.data.images.remove(temp_image)
+    except Exception:
+        pass
 
-    VCTproperties.ao_percent = 0.0
-    VCTproperties.ao_show_progress = True
+class AOBakeResourcePool:
+    """
+    temp images and materials for AO bakes, keyed by resolution and reused across every object of one operator run
+    a released pair is cleared and handed out again, everything the pool created is removed in clear()
+    clear() has to run when the operator ends, even on failure, so no AO_Temp datablock is left orphaned
+    """
+    def __init__(self):
+        self.free_resources = {}
+        self.owned = []
+        self.blank_pixels = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.clear()
+        return False
+
+    def acquire(self, size):
+        free_resources = self.free_resources.setdefault(size, [])
+        if free_resources:
+            return free_resources.pop()
+        resources = create_ao_bake_resources(size)
+        self.owned.append(resources)
+        return resources
+
+    def release(self, temp_image, temp_material):
+        #wipe the previous bake, texels outside the next object's UVs must not leak into its filtering
+        size = temp_image.size[0]
+        blank = self.blank_pixels.get(size)
+        if blank is None:
+            blank = self.blank_pixels[size] = np.zeros(len(temp_image.pixels), dtype=np.float32)
+        temp_image.pixels.foreach_set(blank)
+        self.free_resources.setdefault(size, []).append((temp_image, temp_material))
+
+    def clear(self):
+        for temp_image, temp_material in self.owned:
+            remove_ao_bake_resources(temp_image, temp_material)
+        self.owned.clear()
+        self.free_resources.clear()
+        self.blank_pixels.clear()
+
+def assign_ao_material(mesh, temp_material):
+    """
+    put temp_material on the active slot of mesh, return what restore_ao_material needs to undo it
+    """
+    # Remember original active material and slot index
+    original_active_mat = mesh.active_material
+    original_active_slot = mesh.active_material_index
+
+    # Assign temp mat (make sure the object actually uses it)
+    if mesh.data.materials:
+        if original_active_slot < 0:
+            mesh.data.materials.append(temp_material)
+            mesh.active_material_index = len(mesh.data.materials) - 1
+        else:
+            mesh.data.materials[mesh.active_material_index] = temp_material
+    else:
+        mesh.data.materials.append(temp_material)
+        mesh.active_material_index = 0
+    mesh.active_material = temp_material
+    return original_active_mat, original_active_slot
+
+def restore_ao_material(context, mesh, temp_material, original):
+    # Put back original material if there was one, otherwise remove temp slot
+    original_active_mat, original_active_slot = original
+    if original_active_mat:
+        mesh.active_material = original_active_mat
+        if 0 <= original_active_slot < len(mesh.data.materials):
+            mesh.data.materials[mesh.active_material_index] = original_active_mat
+    else:
+        # If we created a new slot, remove it
+        if temp_material in mesh.data.materials.values():
+            idx = [i for i, m in enumerate(mesh.data.materials) if m == temp_material]
+            previous_active = context.view_layer.objects.active
+            context.view_layer.objects.active = mesh   #material_slot_remove works on the active object
+            for i in idx[::-1]:
+                mesh.active_material_index = i
+                bpy.ops.object.material_slot_remove()
+            context.view_layer.objects.active = previous_active
 
-    meshes = fetch_mesh_in_context(context)
-    if not meshes:
-        return {'CANCELLED'}
+def transfer_ao_to_mesh(context, mesh, temp_image, uv_layer_name, pixel_buffer=None):
+    """
+    sample the baked image at every corner of mesh and write it to the AO channel, return the pixel buffer for reuse
+    """
+    VCTproperties = context.scene.vct_properties
+    width, height = temp_image.size
+    #pixels land in a reused float32 buffer, every corner UV is sampled in one gather
+    pixels = read_image_pixels(temp_image, pixel_buffer)
+    with MeshDataCache(context) as cache:
+        uvs = cache.corner_uvs(mesh, uv_layer_name)
+        radius = None
+        if VCTproperties.ao_filter in {'BOX', 'GAUSSIAN'}:
+            #footprint follows the texel density of each face, so dense and sparse UVs filter alike
+            radius = corner_footprint_radius(
+                uvs, cache.face_loop_starts(mesh), cache.face_loop_totals(mesh), width, height
+            )
+        ao_values = sample_image(pixels, uvs, VCTproperties.ao_filter, 0, radius, VCTproperties.ao_filter_taps)  # R channel
+        apply_kernel_to_mesh(context, mesh, cache, channel_values_kernel(VCTproperties, VCTproperties.ao_vertex_channel, ao_values))
+    return pixels.reshape(-1)
 
+#every object of a group holds its own image and cycles bake buffers at once, this caps their total size
+AO_BATCH_PIXEL_BUDGET = 4 * 4096 * 4096
 
+def ao_bake_groups(bake_items, batch, pixel_budget=AO_BATCH_PIXEL_BUDGET):
+    """
+    split (mesh, uv_layer_name, size) items into groups baked by one bpy.ops.object.bake call each
+    in batch mode objects sharing mesh data go to separate groups, their material slots live on the shared data,
+    and a group takes objects until their images reach pixel_budget, an object alone is always baked
+    """
+    if not batch:
+        return [[item] for item in bake_items]
+    groups = []
+    pixels = []
+    for item in bake_items:
+        item_pixels = item[2] * item[2]
+        for index, group in enumerate(groups):
+            if pixels[index] + item_pixels <= pixel_budget and all(other.data != item[0].data for other, *_ in group):
+                group.append(item)
+                pixels[index] += item_pixels
+                break
+        else:
+            groups.append([item])
+            pixels.append(item_pixels)
+    return groups
+
+#---- AO Bake Cache ----#
+#a content hash of everything that changes the AO of an object is stored on it after a bake,
+#with a digest of the attribute it was written to and of the AO column as the bake left it.
+#incremental bakes skip objects whose stored hash still matches, manual edits to the AO channel included.
+
+AO_HASH_KEY = "vct_ao_hash"
+AO_HASH_SETTINGS = (
+    "ao_engine", "ao_vertex_channel", "ao_uv_index", "ao_texture_size", "ao_adaptive_size", "ao_texels_per_corner",
+    "ao_filter", "ao_filter_taps", "ao_ray_count", "ao_ray_distance", "ao_cosine_weighted", "Bsrgb", "inspect_enable",
+)
+
+def ao_geometry_digest(cache, mesh) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(mesh.matrix_world, dtype=np.float64).tobytes())
+    digest.update(cache.vertex_positions(mesh).tobytes())
+    digest.update(cache.corner_vertex_indices(mesh).tobytes())
+    digest.update(cache.face_loop_totals(mesh).tobytes())
+    return digest.digest()
+
+def ao_evaluated_digest(obj, depsgraph, uv_index=None) -> bytes:
+    """
+    digest of the evaluated mesh, modifiers and shape keys applied, which is what cycles bakes and sees as an occluder
+    """
+    evaluated = obj.evaluated_get(depsgraph)
+    data = evaluated.to_mesh()
+    try:
+        positions = np.empty(len(data.vertices) * 3, dtype=np.float32)
+        data.vertices.foreach_get("co", positions)
+        corner_vertices = np.empty(len(data.loops), dtype=np.int32)
+        data.loops.foreach_get("vertex_index", corner_vertices)
+        totals = np.empty(len(data.polygons), dtype=np.int32)
+        data.polygons.foreach_get("loop_total", totals)
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.asarray(obj.matrix_world, dtype=np.float64).tobytes())
+        for array in (positions, corner_vertices, totals):
+            digest.update(array.tobytes())
+        if uv_index is not None and uv_index < len(data.uv_layers):
+            uvs = np.empty(len(data.loops) * 2, dtype=np.float32)
+            data.uv_layers[uv_index].data.foreach_get("uv", uvs)
+            digest.update(uvs.tobytes())
+        return digest.digest()
+    finally:
+        evaluated.to_mesh_clear()
+
+def ao_render_settings(scene) -> tuple:
+    #the cycles AO pass takes its distance from the world and its quality from the render samples
+    world = scene.world
+    return (
+        scene.cycles.samples,
+        world.light_settings.distance if world is not None else None,
+        scene.render.bake.margin,
+    )
 
-    # Snapshot current selection & mode so we can restore it later
-    prev_mode = bpy.context.mode
-    prev_engine = scene.render.engine
-    view_layer = context.view_layer
-    prev_active = view_layer.objects.active
-    prev_selected = [obj for obj in context.selected_objects]
+def ao_target_digest(context, mesh) -> str:
+    """
+    digest of the color attribute the AO is written to, its name, domain and format, and of its current AO column
+    a renamed, replaced or converted attribute, or a channel cleared or painted over since the bake, is baked again
+    """
+    VCTproperties = context.scene.vct_properties
+    ca = mesh.data.color_attributes
+    if VCTproperties.inspect_enable:
+        attr = ca.get(INSPECT_LAYER_NAME)
+        column = 0
+    else:
+        attr = ca.active_color
+        column = CHANNEL_INDEX[VCTproperties.ao_vertex_channel]
+    if attr is None:
+        return ""
+    digest = hashlib.blake2b(repr((attr.name, attr.domain, attr.data_type)).encode(), digest_size=16)
+    digest.update(np.ascontiguousarray(read_attribute_colors(attr)[:, column]).tobytes())
+    return digest.hexdigest()
+
+def world_bounds(obj):
+    """
+    return the (min, max) corners of the world space bounding box of obj
+    """
+    corners = transform_points(np.array([tuple(corner) for corner in obj.bound_box], dtype=np.float64), obj.matrix_world)
+    return corners.min(axis=0), corners.max(axis=0)
 
-    # Ensure Cycles + object mode for baking
-    scene.render.engine = 'CYCLES'
-    if prev_mode != 'OBJECT':
-        bpy.ops.object.mode_set(mode='OBJECT', toggle=False)
+def nearby_occluders(mesh, occluders, bounds, distance) -> list:
+    """
+    occluders whose bounding box comes within distance of the box of mesh, the only ones its AO rays can reach
+    """
+    low, high = bounds[mesh]
+    low, high = low - distance, high + distance
+    return [
+        obj for obj in occluders
+        if obj is not mesh and np.all(bounds[obj][0] <= high) and np.all(bounds[obj][1] >= low)
+    ]
+
+def ao_content_hashes(context, meshes) -> dict:
+    """
+    hash per mesh of its geometry, transform, UV map and the bake settings, plus the geometry and transform of every
+    occluder within AO distance of it, so changing one object only invalidates the objects around it
+    the cycles bake sees every visible evaluated mesh of the view layer and the world AO settings,
+    the raycast engine only the base mesh data of the baked meshes
+    """
+    VCTproperties = context.scene.vct_properties
+    settings = tuple(getattr(VCTproperties, name) for name in AO_HASH_SETTINGS)
+    bake_engine = VCTproperties.ao_engine != 'RAYCAST'
+    if bake_engine:
+        settings += ao_render_settings(context.scene)
+        occluders = [obj for obj in context.view_layer.objects if obj.type == 'MESH' and obj.visible_get()]
+        world = context.scene.world
+        #without a world there is no AO distance to bound the rays, every occluder counts
+        distance = world.light_settings.distance if world is not None else float('inf')
+    else:
+        occluders = list(meshes)
+        distance = VCTproperties.ao_ray_distance
+    settings = repr(settings).encode()
+    bounds = {obj: world_bounds(obj) for obj in set(occluders) | set(meshes)}
+
+    with MeshDataCache(context) as cache:
+        if bake_engine:
+            depsgraph = context.evaluated_depsgraph_get()
+            uv_index = VCTproperties.ao_uv_index
+            geometry = {obj: ao_evaluated_digest(obj, depsgraph, uv_index) for obj in set(occluders) | set(meshes)}
+        else:
+            geometry = {obj: ao_geometry_digest(cache, obj) for obj in set(occluders) | set(meshes)}
 
-    try:
+        hashes = {}
+        uv_index = VCTproperties.ao_uv_index
         for mesh in meshes:
-            # Skip invalid UV index early
-            uv_index = VCTproperties.ao_uv_index
-            if uv_index >= len(mesh.data.uv_layers):
-                print(f"Skipping {mesh.name}: UV index {uv_index} does not exist")
-                continue
+            digest = hashlib.blake2b(settings, digest_size=16)
+            digest.update(geometry[mesh])
+            #an occluder moving in or out of range changes the names hashed here
+            for obj in sorted(nearby_occluders(mesh, occluders, bounds, distance), key=lambda obj: obj.name):
+                digest.update(obj.name.encode())
+                digest.update(geometry[obj])
+            if bake_engine and uv_index < len(mesh.data.uv_layers):
+                digest.update(cache.corner_uvs(mesh, mesh.data.uv_layers[uv_index].name).tobytes())
+            hashes[mesh] = digest.hexdigest()
+    return hashes
+
+class AOBakeJob:
+    """
+    AO to vertex color split into steps: every step() transfers one baked object, baking its group first when it is
+    the first of the group, or casts the rays of one chunk of vertices with the raycast engine, and returns False
+    once everything is written. A cycles bake call itself can't be interrupted, cancelling waits for it to return
+    finish() or cancel() end the job, both restore engine, selection, active object, mode and materials
+    the blocking bake and the modal operator drive the same job, so they write the same result
+    """
+    def __init__(self, context, meshes=None, progress=None):
+        self.context = context
+        self.scene = context.scene
+        self.VCTproperties = self.scene.vct_properties
+        self.meshes = fetch_mesh_in_context(context) if meshes is None else meshes
+        #progress(mesh, done, total) is called after every mesh is written, headless runs use it instead of ao_percent
+        self.progress = progress
+        self.fraction = 0.0
+        self.start_time = 0.0
+        self.steps = None
+        self.hashes = {}
+        self.cache_hits = 0
+        self.baked = 0
+        #(object name, reason) of every object left without AO, reported when the job ends
+        self.failures = []
+
+    def begin(self) -> bool:
+        if not self.meshes:
+            return False
+        self.VCTproperties.ao_percent = 0.0
+        self.VCTproperties.ao_eta = 0.0
+        self.VCTproperties.ao_show_percent = True
+        self.start_time = time.perf_counter()
+        if self.VCTproperties.ao_incremental:
+            #content hashes are taken before anything is written, the bake itself doesn't change any of their inputs
+            #the target digest is stored as written by the bake, so it matches until the AO column changes
+            self.hashes = ao_content_hashes(self.context, self.meshes)
+            dirty = [
+                mesh for mesh in self.meshes
+                if mesh.get(AO_HASH_KEY) != self.hashes[mesh] + ao_target_digest(self.context, mesh)
+            ]
+            self.cache_hits = len(self.meshes) - len(dirty)
+            self.meshes = dirty
+        if not self.meshes:
+            self.steps = self._no_steps()
+        elif self.VCTproperties.ao_engine == 'RAYCAST':
+            self.steps = self._raycast_steps()
+        else:
+            self.steps = self._bake_steps()
+        return True
 
-            # Isolate current object selection to avoid "No active image" across others
-            for o in prev_selected:
-                o.select_set(False)
-            mesh.select_set(True)
-            view_layer.objects.active = mesh
+    def _no_steps(self):
+        return
+        yield
+
+    def _written(self, mesh, done, total, baked=True):
+        if baked:
+            self.baked += 1
+            if mesh in self.hashes:
+                mesh[AO_HASH_KEY] = self.hashes[mesh] + ao_target_digest(self.context, mesh)
+        if self.progress:
+            self.progress(mesh, done, total)
+
+    def summary(self) -> str:
+        """
+        cache hit and miss count, the time saved is estimated from the average time of the baked objects
+        """
+        elapsed = time.perf_counter() - self.start_time
+        saved = elapsed / self.baked * self.cache_hits if self.baked else 0.0
+        return f"AO cache: {self.cache_hits} unchanged skipped, {self.baked} baked in {elapsed:.1f}s, ~{saved:.1f}s saved"
+
+    def failure_report(self) -> str:
+        names = "; ".join(f"{name}: {reason}" for name, reason in self.failures)
+        return f"AO bake failed for {len(self.failures)} object(s), {names}"
+
+    def step(self) -> bool:
+        try:
+            next(self.steps)
+        except StopIteration:
+            return False
+        return True
+
+    def eta(self) -> float:
+        """
+        seconds left, extrapolated from the time spent on the finished fraction of the work
+        """
+        if self.fraction <= 0.0:
+            return 0.0
+        elapsed = time.perf_counter() - self.start_time
+        return elapsed / self.fraction * (1.0 - self.fraction)
+
+    def _advance(self, fraction):
+        self.fraction = fraction
+        self.VCTproperties.ao_percent = round(fraction * 100, 2)
+        self.VCTproperties.ao_eta = self.eta()
+
+    def finish(self):
+        self._end()
+        return {'FINISHED'}
 
-            # Create temp image + material, make Image Texture node active
-            temp_image = bpy.data.images.new(
-                "AO_Temp", width=texture_size_map, height=texture_size_map, alpha=False
+    def cancel(self):
+        """
+        stop the job, objects already written keep their AO
+        FINISHED when any object was written so the undo step holding those writes is pushed, CANCELLED otherwise
+        """
+        #closing the generator runs its finally, restoring materials, selection and mode
+        self._end()
+        return {'FINISHED'} if self.baked else {'CANCELLED'}
+
+    def _end(self):
+        if self.steps is not None:
+            self.steps.close()
+            self.steps = None
+        self.VCTproperties.ao_show_percent = False
+
+    def _raycast_steps(self):
+        """
+        AO from hemisphere rays cast at every vertex against the whole selection, no UV map or image needed
+        """
+        context = self.context
+        VCTproperties = self.VCTproperties
+        meshes = self.meshes
+        distance = VCTproperties.ao_ray_distance
+        #lift the origins off their own surface, relative to the ray length
+        bias = max(distance * 1e-3, 1e-5)
+        with MeshDataCache(context) as cache:
+            world = {}
+            for mesh in meshes:
+                world[mesh] = (
+                    transform_points(cache.vertex_positions(mesh), mesh.matrix_world),
+                    transform_normals(cache.vertex_normals(mesh), mesh.matrix_world),
+                )
+            tree = build_occluder_tree(
+                [(world[mesh][0], cache.triangle_vertex_indices(mesh)) for mesh in meshes]
             )
-            temp_material = bpy.data.materials.new(name="AO_Temp_Material")
-            temp_material.use_nodes = True
-            nt = temp_material.node_tree
-
-            # Ensure there is at least one output so the node tree is valid (defensive)
-            if not any(n.type == 'OUTPUT_MATERIAL' for n in nt.nodes):
-                out = nt.nodes.new("ShaderNodeOutputMaterial")
-                out.location = (300, 0)
-
-            tex_node = nt.nodes.new("ShaderNodeTexImage")
-            tex_node.image = temp_image
-            # Important: make the image node the active one for baking
-            for n in nt.nodes: n.select = False
-            tex_node.select = True
-            nt.nodes.active = tex_node
-
-            # Remember original active material and slot index
-            original_active_mat = mesh.active_material
-            original_active_slot = mesh.active_material_index
-
-            # Assign temp mat (make sure the object actually uses it)
-            if mesh.data.materials:
-                if original_active_slot < 0:
-                    mesh.data.materials.append(temp_material)
-                    mesh.active_material_index = len(mesh.data.materials) - 1
-                else:
-                    mesh.data.materials[mesh.active_material_index] = temp_material
-            else:
-                mesh.data.materials.append(temp_material)
-                mesh.active_material_index = 0
-            mesh.active_material = temp_material
 
-            # Make the correct UV the active one for baking
-            mesh.data.uv_layers.active_index = uv_index
-            uv_layer_name = mesh.data.uv_layers[uv_index].name
+            total = sum(len(positions) for positions, _ in world.values())
+            done = 0
+            for mesh in meshes:
+                positions, normals = world[mesh]
+                vertex_ao = np.empty(len(positions), dtype=np.float32)
+                for start, ao in vertex_occlusion_chunks(
+                    tree, positions + normals * bias, normals,
+                    VCTproperties.ao_ray_count, distance, VCTproperties.ao_cosine_weighted
+                ):
+                    vertex_ao[start:start + len(ao)] = ao
+                    done += len(ao)
+                    self._advance(done / max(total, 1))
+                    yield
+                kernel = vertex_values_kernel(
+                    lambda values: channel_values_kernel(VCTproperties, VCTproperties.ao_vertex_channel, values),
+                    vertex_ao, cache.corner_vertex_indices(mesh)
+                )
+                apply_kernel_to_mesh(context, mesh, cache, kernel)
+                self._written(mesh, meshes.index(mesh) + 1, len(meshes))
+
+    def _bake_steps(self):
+        context = self.context
+        scene = self.scene
+        VCTproperties = self.VCTproperties
+        texture_size_map = {
+            '256': 256, '512': 512, '1024': 1024, '2048': 2048, '4096': 4096,
+        }
+        max_size = texture_size_map[VCTproperties.ao_texture_size]
+
+        # Snapshot current selection & mode so we can restore it later
+        prev_mode = bpy.context.mode
+        prev_engine = scene.render.engine
+        view_layer = context.view_layer
+        prev_active = view_layer.objects.active
+        prev_selected = [obj for obj in context.selected_objects]
+
+        # Ensure Cycles + object mode for baking
+        scene.render.engine = 'CYCLES'
+        if prev_mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT', toggle=False)
+
+        pixel_buffer = None
+        pool = AOBakeResourcePool()
+        bound = []
+        try:
+            # Skip invalid UV index early
+            uv_index = VCTproperties.ao_uv_index
+            bake_items = []
+            with MeshDataCache(context) as cache:
+                for mesh in self.meshes:
+                    if uv_index >= len(mesh.data.uv_layers):
+                        self.failures.append((mesh.name, f"UV index {uv_index} does not exist"))
+                        continue
+                    uv_layer_name = mesh.data.uv_layers[uv_index].name
+                    size = max_size
+                    if VCTproperties.ao_adaptive_size:
+                        #texture size is the cap, small or sparse meshes get the smallest size that keeps the texel budget
+                        uv_area = face_uv_areas(
+                            cache.corner_uvs(mesh, uv_layer_name), cache.face_loop_starts(mesh), cache.face_loop_totals(mesh)
+                        ).sum()
+                        size = adaptive_bake_size(
+                            uv_area, cache.corner_count(mesh), VCTproperties.ao_texels_per_corner, texture_size_map.values(), max_size
+                        )
+                    bake_items.append((mesh, uv_layer_name, size))
 
             # Bake settings
             scene.cycles.bake_type = 'AO'
             scene.render.bake.use_pass_direct = False
             scene.render.bake.use_pass_indirect = False
             scene.render.bake.use_pass_color = True
+            scene.render.bake.use_selected_to_active = False
             scene.render.bake.target = 'IMAGE_TEXTURES'  # explicit
 
-            # Try baking this single object only
-            try:
-                bpy.ops.object.bake(type='AO')
-            except RuntimeError as e:
-                print(f"Baking failed for {mesh.name}: {e}")
-                # Clean up safely and move to next object
-                if temp_material and temp_material.users == 0:
-                    try: bpy.data.materials.remove(temp_material)
-                    except Exception: pass
-                if temp_image and temp_image.users == 0:
-                    try: bpy.data.images.remove(temp_image)
-                    except Exception: pass
-                # Restore original material if we had one
-                if original_active_mat:
-                    mesh.active_material = original_active_mat
-                    if 0 <= original_active_slot < len(mesh.data.materials):
-                        mesh.data.materials[mesh.active_material_index] = original_active_mat
-                continue
-
-            # ---- Transfer baked AO to vertex colors ----
-            bm = bmesh_from_object(context, mesh)
-            color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-            bm_uv_layer = bm.loops.layers.uv.get(uv_layer_name) or bm.loops.layers.uv.active
-
-            width, height = temp_image.size
-            pixels = temp_image.pixels[:]  # RGBA flat array
-
-            def sample_ao(u, v):
-                px = min(max(int(u * width), 0), width - 1)
-                py = min(max(int(v * height), 0), height - 1)
-                idx = (py * width + px) * 4
-                return pixels[idx]  # R channel
-
-            affect_only_selected = getattr(VCTproperties, "affect_only_selected", False)
-            edit_mode = (prev_mode == 'EDIT_MESH')  # we switched to OBJECT for bake
+            #batch mode bakes every object of a group in a single cycles call, each into its own image
+            baked_count = 0
+            for group in ao_bake_groups(bake_items, VCTproperties.ao_batch_bake):
+                # Isolate the group selection to avoid "No active image" across others
+                for o in context.selected_objects:
+                    o.select_set(False)
+
+                for mesh, uv_layer_name, size in group:
+                    mesh.select_set(True)
+                    # Take a temp image + material from the pool, its Image Texture node is already active
+                    temp_image, temp_material = pool.acquire(size)
+                    original = assign_ao_material(mesh, temp_material)
+                    # Make the correct UV the active one for baking
+                    mesh.data.uv_layers.active = mesh.data.uv_layers[uv_layer_name]
+                    bound.append((mesh, uv_layer_name, temp_image, temp_material, original))
+                view_layer.objects.active = group[0][0]
+
+                failed = {}
+                try:
+                    bpy.ops.object.bake(type='AO')
+                except RuntimeError as e:
+                    if len(group) == 1:
+                        failed[group[0][0]] = str(e)
+                    else:
+                        #one bad object fails the whole call, bake the group again one object at a time so only it is lost
+                        for mesh, *_ in group:
+                            for o in context.selected_objects:
+                                o.select_set(False)
+                            mesh.select_set(True)
+                            view_layer.objects.active = mesh
+                            try:
+                                bpy.ops.object.bake(type='AO')
+                            except RuntimeError as e:
+                                failed[mesh] = str(e)
+                self.failures += [(mesh.name, reason) for mesh, reason in failed.items()]
+
+                # ---- Transfer baked AO to vertex colors, then clean up temp data and restore original materials ----
+                #the cycles call above can't be interrupted, the job yields between the transfers that follow it
+                while bound:
+                    mesh, uv_layer_name, temp_image, temp_material, original = bound.pop(0)
+                    baked = mesh not in failed
+                    if baked:
+                        pixel_buffer = transfer_ao_to_mesh(context, mesh, temp_image, uv_layer_name, pixel_buffer)
+                    restore_ao_material(context, mesh, temp_material, original)
+                    pool.release(temp_image, temp_material)
+                    baked_count += 1
+                    self._written(mesh, baked_count, len(bake_items), baked)
+
+                    #update percent, this object's material is restored so the job can stop here
+                    self._advance(baked_count / len(bake_items))
+                    yield
+
+        finally:
+            # Objects of a cancelled group that were not transferred yet get their materials back untouched
+            for mesh, uv_layer_name, temp_image, temp_material, original in bound:
+                restore_ao_material(context, mesh, temp_material, original)
+            # Remove every temp datablock in one place, then restore engine, selection, active, and mode
+            pool.clear()
+            scene.render.engine = prev_engine
+            for o in context.selected_objects:
+                o.select_set(False)
+            for o in prev_selected:
+                o.select_set(True)
+            view_layer.objects.active = prev_active
+            if prev_mode != bpy.context.mode:
+                try:
+                    bpy.ops.object.mode_set(mode=prev_mode, toggle=False)
+                except Exception:
+                    pass
+
+def bake_ao_to_vertex_color(context, meshes=None, progress=None, report=None):
+    """
+    bake AO of the meshes, the selection by default, into the AO channel with the settings of the scene properties
+    blocking version of the modal operator, used by redo and headless runs
+    report is an operator's report(), failures are printed without one
+    """
+    job = AOBakeJob(context, meshes, progress)
+    result = run_ao_bake_job(job)
+    if 'FINISHED' in result and context.scene.vct_properties.ao_incremental:
+        print(job.summary())
+    if job.failures:
+        if report:
+            report({'WARNING'}, job.failure_report())
+        else:
+            print(job.failure_report())
+    return result
 
-            for face in bm.faces:
-                for loop in face.loops:
-                    if edit_mode and affect_only_selected and not loop.vert.select:
-                        continue
-                    uv = loop[bm_uv_layer].uv
-                    ao_val = sample_ao(uv.x, uv.y)
-                    current = loop[color_layer]
-                    loop[color_layer] = value_to_channel(
-                        ao_val, Echannel, current, fillgrayscale=fill_grayscale
-                    )
-
-            bmesh_to_object(context, bm, mesh)
-
-            #update percent
-            VCTproperties.ao_percent = round((meshes.index(mesh) + 1) / len(meshes) * 100, 2)
-
-            # Cleanup temp data and restore original material
-            # Put back original material if there was one, otherwise remove temp slot
-            if original_active_mat:
-                mesh.active_material = original_active_mat
-                if 0 <= original_active_slot < len(mesh.data.materials):
-                    mesh.data.materials[mesh.active_material_index] = original_active_mat
-            else:
-                # If we created a new slot, remove it
-                if temp_material in mesh.data.materials.values():
-                    idx = [i for i, m in enumerate(mesh.data.materials) if m == temp_material]
-                    for i in idx[::-1]:
-                        mesh.active_material_index = i
-                        bpy.ops.object.material_slot_remove()
-
-            # Remove temp datablocks if not used elsewhere
-            try:
-                if temp_material and temp_material.users == 0:
-                    bpy.data.materials.remove(temp_material)
-            except Exception:
-                pass
-            try:
-                if temp_image and temp_image.users == 0:
-                    bpy.data.images.remove(temp_image)
-            except Exception:
-                pass
+def run_ao_bake_job(job):
+    """
+    drive a job to the end in one blocking loop
+    """
+    if not job.begin():
+        return {'CANCELLED'}
+    try:
+        while job.step():
+            pass
+    except Exception:
+        job.cancel()
+        raise
+    return job.finish()
+
+#events the modal AO bake lets through, everything else could change the selection under the job
+AO_BAKE_PASS_THROUGH = {
+    'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE', 'MOUSEMOVE', 'TRACKPADPAN', 'TRACKPADZOOM', 'NDOF_MOTION',
+}
+
+def ao_bake_invoke(self, context):
+    self.job = AOBakeJob(context)
+    if not self.job.begin():
+        return {'CANCELLED'}
+    wm = context.window_manager
+    self._timer = wm.event_timer_add(0.01, window=context.window)
+    wm.modal_handler_add(self)
+    return {'RUNNING_MODAL'}
+
+def ao_bake_modal(self, context, event):
+    if event.type == 'ESC':
+        ao_bake_end(self, context)
+        percent = context.scene.vct_properties.ao_percent
+        result = self.job.cancel()
+        self.report({'WARNING'}, f"AO bake cancelled at {percent:.0f}%, {self.job.baked} object(s) kept their new AO")
+        return result
+    if event.type != 'TIMER':
+        return {'PASS_THROUGH'} if event.type in AO_BAKE_PASS_THROUGH else {'RUNNING_MODAL'}
 
-        return {'FINISHED'}
+    try:
+        running = self.job.step()
+    except Exception:
+        ao_bake_end(self, context)
+        self.job.cancel()
+        raise
+    tag_redraw_ui(context)
+    if running:
+        return {'RUNNING_MODAL'}
+    ao_bake_end(self, context)
+    if context.scene.vct_properties.ao_incremental:
+        self.report({'INFO'}, self.job.summary())
+    if self.job.failures:
+        self.report({'WARNING'}, self.job.failure_report())
+    return self.job.finish()
+
+def ao_bake_end(self, context):
+    if self._timer is not None:
+        context.window_manager.event_timer_remove(self._timer)
+        self._timer = None
+    tag_redraw_ui(context)
+
+def tag_redraw_ui(context):
+    #the progress lives in the sidebar of every 3d view
+    for area in context.screen.areas:
+        if area.type == 'VIEW_3D':
+            area.tag_redraw()
 
-    finally:
-        # Restore engine, selection, active, and mode
-        VCTproperties.ao_show_progress = False
-        scene.render.engine = prev_engine
-        for o in context.selected_objects:
-            o.select_set(False)
-        for o in prev_selected:
-            o.select_set(True)
-        view_layer.objects.active = prev_active
-        if prev_mode != bpy.context.mode:
-            try:
-                bpy.ops.object.mode_set(mode=prev_mode, toggle=False)
-            except Exception:
-                pass
+#---- Texture to Vertex Color ----#
 
-def invert_vertex_colors(context):
+def texture_values_kernel(VCTproperties, image, corner_values):
+    """
+    return a kernel writing sampled texture values, one value per corner for a channel or (N,4) colors for RGBA
+    byte images hand out their stored values, already in the vertex color space, only float images are linear
+    """
+    grayscale = VCTproperties.inspect_enable
+    convert = image.is_float and VCTproperties.Bsrgb
+    if VCTproperties.texture_target_channel != 'RGBA' or grayscale:
+        Echannel = VCTproperties.inspect_channel if grayscale else VCTproperties.texture_target_channel
+        if convert:
+            corner_values = linear_to_srgb_array(corner_values)
+        return corner_kernel(lambda colors, mask: set_channel(colors, Echannel, corner_values, mask, grayscale))
+    if convert:
+        corner_values[:, :3] = linear_to_srgb_array(corner_values[:, :3])
+    return corner_kernel(lambda colors, mask: set_colors(colors, corner_values, mask))
+
+def texture_to_vertex_color(context):
     VCTproperties = context.scene.vct_properties
+    image = VCTproperties.texture_image
+    if image is None or not image.size[0]:
+        return {'CANCELLED'}
     meshes = fetch_mesh_in_context(context)
-    Echannel = VCTproperties.clear_channel
     if not meshes:
         return {'CANCELLED'}
 
-    for mesh in meshes:
-        bm = bmesh_from_object(context, mesh)
-        color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-
-        for face in bm.faces:
-            for loop in face.loops:
-                if context.mode == 'EDIT_MESH':
-                    if should_affect_loop_editmode(VCTproperties, face, loop):
-                        source_value = getattr(loop[color_layer], {'R': 'x', 'G': 'y', 'B': 'z', 'A': 'w'}[Echannel])
-                        loop[color_layer] = value_to_channel(1.0 - source_value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
-                else:
-                    source_value = getattr(loop[color_layer], {'R': 'x', 'G': 'y', 'B': 'z', 'A': 'w'}[Echannel])
-                    loop[color_layer] = value_to_channel(1.0 - source_value, Echannel, loop[color_layer], fillgrayscale=True if VCTproperties.inspect_enable else False)
+    #the whole image is read once, every corner of every mesh is sampled from the same buffer
+    pixels = read_image_pixels(image)
+    width, height = image.size
+    if VCTproperties.texture_target_channel == 'RGBA' and not VCTproperties.inspect_enable:
+        channel = slice(0, 4)
+    else:
+        channel = CHANNEL_INDEX[VCTproperties.texture_source_channel]
+    uv_index = VCTproperties.texture_uv_index
+    with MeshDataCache(context) as cache:
+        for mesh in meshes:
+            if uv_index >= len(mesh.data.uv_layers):
+                print(f"Skipping {mesh.name}: UV index {uv_index} does not exist")
+                continue
+            uvs = cache.corner_uvs(mesh, mesh.data.uv_layers[uv_index].name)
+            radius = None
+            if VCTproperties.texture_filter in {'BOX', 'GAUSSIAN'}:
+                radius = corner_footprint_radius(
+                    uvs, cache.face_loop_starts(mesh), cache.face_loop_totals(mesh), width, height
+                )
+            values = sample_image(pixels, uvs, VCTproperties.texture_filter, channel, radius, VCTproperties.texture_filter_taps)
+            apply_kernel_to_mesh(context, mesh, cache, texture_values_kernel(VCTproperties, image, values))
+    return {'FINISHED'}
 
-        bmesh_to_object(context, bm, mesh)
+def invert_vertex_colors(context):
+    VCTproperties = context.scene.vct_properties
+    Echannel = VCTproperties.clear_channel
+    grayscale = VCTproperties.inspect_enable
+    srgb = VCTproperties.Bsrgb
 
-    return {'FINISHED'}
+    return apply_channel_kernel(context, lambda colors, mask: invert_channel(colors, Echannel, mask, grayscale, srgb))
 
 #---- GPU Functions ----#
 
@@ -1068,12 +1649,35 @@ def set_no_active_trace(context):
     for i in context.scene.vct_properties.trace_gradient_active:
         context.scene.vct_properties.trace_gradient_active[i] = False
 
+def trace_values_for(self, start, end):
+    """
+    return the per vertex value function of the current trace, None while the trace is too short to define a gradient
+    """
+    InvertGradient = bpy.context.scene.vct_properties.gradient_invert
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    if self.Bcircle:
+        # radial: center at start, radius from start->end
+        radius = (dx * dx + dy * dy) ** 0.5
+        if radius <= 1e-6:
+            return None
+        return lambda positions_2d: radial_trace_values(positions_2d, start, radius, InvertGradient)
+    # linear along the traced line
+    if dx * dx + dy * dy <= 1e-12:
+        return None
+    return lambda positions_2d: linear_trace_values(positions_2d, start, end, InvertGradient)
+
+def cancel_trace_preview(self):
+    if self.preview is not None:
+        self.preview.cancel()
+        self.preview = None
+
 def trace_gradient_modal(self, context, event):
         # ask the area to redraw so our _draw_2d runs smoothly
         if context.area:
             context.area.tag_redraw()
 
         if context.area and context.area.type != 'VIEW_3D':
+            cancel_trace_preview(self)
             remove_handler(self)
             self.report({'INFO'}, "Not in 3D View")
             set_no_active_trace(context)
@@ -1081,6 +1685,7 @@ def trace_gradient_modal(self, context, event):
 
         if event.type in {'ESC', 'RIGHTMOUSE'}:
             self.is_drawing = False
+            cancel_trace_preview(self)
             remove_handler(self)
             self.report({'INFO'}, "Cancelled")
             set_no_active_trace(context)
@@ -1090,10 +1695,18 @@ def trace_gradient_modal(self, context, event):
             self.start = (event.mouse_region_x, event.mouse_region_y)
             self.current = self.start
             self.is_drawing = True
+            if context.scene.vct_properties.Btrace_preview:
+                #the view does not change mid drag, so vertices are projected once here
+                cancel_trace_preview(self)
+                self.preview = TraceGradientPreview(context, context.region, context.region_data)
             return {'RUNNING_MODAL'}
 
         if event.type == 'MOUSEMOVE' and self.is_drawing:
             self.current = (event.mouse_region_x, event.mouse_region_y)
+            if self.preview is not None:
+                trace_values = trace_values_for(self, self.start, self.current)
+                if trace_values is not None:
+                    self.preview.refresh(trace_values)
             return {'RUNNING_MODAL'}
 
         if event.type == 'LEFTMOUSE' and event.value == 'RELEASE' and self.is_drawing:
@@ -1102,7 +1715,10 @@ def trace_gradient_modal(self, context, event):
             self.is_drawing = False
             remove_handler(self)
 
-            if self.Bcircle:
+            if self.preview is not None:
+                result = self.preview.finish(trace_values_for(self, self.start, end))
+                self.preview = None
+            elif self.Bcircle:
                 # radial: center at start, radius from start->end
                 cx, cy = self.start
                 ex, ey = end
@@ -1126,11 +1742,203 @@ def trace_gradient_modal(self, context, event):
         
         return {'RUNNING_MODAL'}
 
+class TraceGradientPreview:
+    """
+    live trace gradient while dragging: vertex positions are projected once at drag start, each refresh only redoes
+    the 1D line/radius step and writes it back. Refreshes are throttled to the frame budget, and when one takes longer
+    than the budget the next ones only update every n-th corner, rotating which ones, until the drag is released.
+    Object mode writes a whole attribute whatever the stride, so a refresh also stops at the budget and carries on with
+    the next meshes on the following one, and refreshes are spaced out so writing never takes most of the time
+    """
+    MAX_STRIDE = 64
+    #at least this many times the last refresh passes before the next one
+    IDLE_FACTOR = 2.0
+
+    def __init__(self, context, region, rv3d):
+        self.context = context
+        self.VCTproperties = context.scene.vct_properties
+        self.budget = self.VCTproperties.trace_preview_budget / 1000.0
+        self.cache = MeshDataCache(context)
+        self.stride = 1
+        self.offset = 0
+        self.last_refresh = 0.0
+        self.interval = self.budget
+        self.next_target = 0
+        self.targets = []
+
+        meshes = fetch_mesh_in_context(context)
+        if not isinstance(meshes, list):
+            return
+        if not self.VCTproperties.inspect_enable:
+            #creating an attribute toggles out of edit mode, which frees every edit bmesh, so all are created up front
+            for mesh in meshes:
+                ensure_color_attribute(context, mesh)
+        for mesh in meshes:
+            target = self._acquire(mesh, region, rv3d)
+            if target is not None:
+                self.targets.append(target)
+
+    def _acquire(self, mesh, region, rv3d):
+        cache = self.cache
+        target = {"mesh": mesh}
+        if self.context.mode != 'EDIT_MESH':
+            attr = fetch_relevant_color_attribute(self.context, mesh)
+            if attr is None:
+                return None
+            target["attr"] = attr
+            target["original"] = read_attribute_colors(attr)
+            target["corners"] = np.arange(len(target["original"]))
+            #rows of a point attribute are the vertices themselves
+            if attr.domain == 'POINT':
+                target["corner_vertex_indices"] = target["corners"]
+        else:
+            color_layer, bm = cache.color_layer(mesh)
+            if color_layer is None:
+                return None
+            loops, corners = cache.edit_loops(mesh, bm)
+            if not loops:
+                return None
+            elements, linear = edit_color_elements(mesh, color_layer, loops)
+            original = np.zeros((cache.corner_count(mesh), 4), dtype=np.float32)
+            original[corners] = read_bmesh_colors(elements, color_layer, linear)
+            target.update(bm=bm, color_layer=color_layer, loops=elements, linear=linear, corners=corners, original=original)
+        target["working"] = target["original"].copy()
+        target["positions_2d"] = cache.region_positions(mesh, region, rv3d)
+        target.setdefault("corner_vertex_indices", cache.corner_vertex_indices(mesh))
+        return target
+
+    def _write(self, trace_values, stride, offset, deadline=None):
+        """
+        write the gradient to every target, or only up to the deadline, starting from the first one left out last time
+        """
+        count = len(self.targets)
+        for step in range(count):
+            target = self.targets[(self.next_target + step) % count]
+            values = trace_values(target["positions_2d"])
+            picked = np.arange(offset, len(target["corners"]), stride)
+            corners = target["corners"][picked]
+            corner_values = values[target["corner_vertex_indices"][corners]]
+            visible = ~np.isnan(corner_values)
+            picked, corners = picked[visible], corners[visible]
+
+            #the kernel runs on a compact copy of the picked rows only
+            rows = target["working"][corners]
+            gradient_kernel(self.VCTproperties, corner_values[visible])(rows, None)
+            target["working"][corners] = rows
+            self._flush(target, picked)
+            if deadline is not None and time.perf_counter() > deadline:
+                self.next_target = (self.next_target + step + 1) % count
+                return
+
+    def _flush(self, target, picked=None):
+        mesh = target["mesh"]
+        if "attr" in target:
+            write_attribute_colors(target["attr"], target["working"])
+            mesh.data.update()
+        else:
+            loops = target["loops"]
+            if picked is None:
+                picked = range(len(loops))
+            corners = target["corners"]
+            write_bmesh_colors([loops[i] for i in picked], target["color_layer"], target["working"][corners[picked]], target["linear"])
+            bmesh_to_object(self.context, target["bm"], mesh)
+
+    def refresh(self, trace_values):
+        now = time.perf_counter()
+        if now - self.last_refresh < self.interval:
+            return
+        self.offset = (self.offset + 1) % self.stride
+        self._write(trace_values, self.stride, self.offset, now + self.budget)
+        elapsed = time.perf_counter() - now
+        if elapsed > self.budget and self.stride < self.MAX_STRIDE:
+            self.stride *= 2
+        elif elapsed < self.budget / 4.0 and self.stride > 1:
+            self.stride //= 2
+        self.offset %= self.stride
+        #a single mesh write over the budget can't be decimated away, the next refresh waits for it instead
+        self.interval = max(self.budget, elapsed * self.IDLE_FACTOR)
+        self.last_refresh = time.perf_counter()
+
+    def finish(self, trace_values):
+        """
+        write the full resolution gradient, or restore the original colors when the trace is degenerate
+        """
+        if trace_values is None:
+            self.cancel()
+            return {'CANCELLED'}
+        self._write(trace_values, 1, 0)
+        self.cache.free()
+        return {'FINISHED'} if self.targets else {'CANCELLED'}
+
+    def cancel(self):
+        for target in self.targets:
+            target["working"][:] = target["original"]
+            self._flush(target)
+        self.cache.free()
+
+
+def fetch_region_and_rv3d(context, region=None, rv3d=None):
+    """
+    return the given region/rv3d, or fall back to the first 3D view's window region, (None, None) if there is none
+    """
+    if region is not None and rv3d is not None:
+        return region, rv3d
+    area_3d = None
+    for area in context.screen.areas:
+        if area.type == 'VIEW_3D':
+            area_3d = area
+            break
+    if area_3d is None:
+        return None, None
+    region = next((r for r in area_3d.regions if r.type == 'WINDOW'), None)
+    rv3d = area_3d.spaces.active.region_3d if area_3d.spaces.active else None
+    if region is None or rv3d is None:
+        return None, None
+    return region, rv3d
+
+def linear_trace_values(positions_2d, start_xy, end_xy, invert=False) -> np.ndarray:
+    """
+    normalized position of each projected vertex along the traced line, 0 at start and 1 at end
+    """
+    origin = np.asarray(start_xy, dtype=np.float64)
+    line_dir = np.asarray(end_xy, dtype=np.float64) - origin
+    t = np.clip((positions_2d - origin) @ line_dir / (line_dir @ line_dir), 0.0, 1.0)
+    return 1.0 - t if invert else t
+
+def radial_trace_values(positions_2d, center_xy, radius_px, invert=False) -> np.ndarray:
+    """
+    1 at the traced center falling to 0 at the radius, per projected vertex
+    """
+    d = np.linalg.norm(positions_2d - np.asarray(center_xy, dtype=np.float64), axis=1)
+    t = np.clip(d / radius_px, 0.0, 1.0)
+    return t if invert else 1.0 - t
+
+def apply_trace_gradient(context, meshes, cache, region, rv3d, trace_values):
+    """
+    write trace_values(positions_2d) on every mesh, vertices behind the view are left untouched
+    """
+    VCTproperties = context.scene.vct_properties
+    for mesh in meshes:
+        values = trace_values(cache.region_positions(mesh, region, rv3d))
+        kernel = vertex_values_kernel(lambda values: trace_kernel(VCTproperties, values), values, cache.corner_vertex_indices(mesh))
+        apply_kernel_to_mesh(context, mesh, cache, kernel)
+
+def trace_kernel(VCTproperties, values):
+    """
+    return a gradient kernel for one trace value per row, rows behind the view are nan and left untouched
+    """
+    visible = ~np.isnan(values)
+    def kernel(colors, mask):
+        #the gradient kernel only ever sees the visible rows and their values, like the preview does
+        rows = visible if mask is None else mask & visible
+        picked = colors[rows]
+        gradient_kernel(VCTproperties, values[rows])(picked, None)
+        colors[rows] = picked
+    return kernel
+
 def fill_gradient_camera_space(context, start_xy, end_xy, region=None, rv3d=None):
     VCTproperties = context.scene.vct_properties
-    Echannel = VCTproperties.gradient_channel
     InvertGradient = VCTproperties.gradient_invert
-    ColorGradient = VCTproperties.Bcolor_gradient
 
     # Validate the line
     x1, y1 = start_xy
@@ -1140,144 +1948,40 @@ def fill_gradient_camera_space(context, start_xy, end_xy, region=None, rv3d=None
     if length_sq <= 1e-12:
         return {'CANCELLED'}
 
-    # Fallback to the active 3D view's region/rv3d if not provided
-    if region is None or rv3d is None:
-        area_3d = None
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                area_3d = area
-                break
-        if area_3d is None:
-            return {'CANCELLED'}
-        region = next((r for r in area_3d.regions if r.type == 'WINDOW'), None)
-        rv3d = area_3d.spaces.active.region_3d if area_3d.spaces.active else None
-        if region is None or rv3d is None:
-            return {'CANCELLED'}
-
-    line_origin = mathutils.Vector((x1, y1))
-    line_dir = mathutils.Vector((dx, dy))
-    line_dir_n = line_dir / math.sqrt(length_sq)
+    region, rv3d = fetch_region_and_rv3d(context, region, rv3d)
+    if region is None:
+        return {'CANCELLED'}
 
     meshes = fetch_mesh_in_context(context)
     if not meshes:
         return {'CANCELLED'}
 
-    for mesh in meshes:
-        bm = bmesh_from_object(context, mesh)
-
-        # choose the correct color layer (respects Inspect mode)
-        color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-        if color_layer is None:
-            bmesh_to_object(context, bm, mesh)
-            continue
-
-        mw = mesh.matrix_world
-        affect_only_selected = getattr(VCTproperties, "affect_only_selected", False)
-        edit_mode = (context.mode == 'EDIT_MESH')
-
-        for face in bm.faces:
-            for loop in face.loops:
-                if should_affect_loop_editmode(VCTproperties, face, loop) or not edit_mode:
-                    world_co = mw @ loop.vert.co
-                    # Project to 2D (region) coordinates
-                    p2d = view3d_utils.location_3d_to_region_2d(region, rv3d, world_co)
-                    if p2d is None:
-                        continue
-
-                    # Project this point onto the traced line to get normalized t in [0..1]
-                    v = mathutils.Vector((p2d.x, p2d.y)) - line_origin
-                    t = v.dot(line_dir_n) / math.sqrt(length_sq) * math.sqrt(length_sq)  # collapses to v.dot(n)
-                    # Because n is unit along the line direction, t is in pixels from start; normalize by line length:
-                    t = v.dot(line_dir) / length_sq  # equivalent and clearer
-                    t = max(0.0, min(1.0, t))
-
-                    value = 1.0 - t if InvertGradient else t
-                    if ColorGradient and not VCTproperties.inspect_enable:
-                        loop[color_layer] = lerp_vector4(
-                            VCTproperties.gradient_color_start,
-                            VCTproperties.gradient_color_end,
-                            value
-                        )
-                    else:
-                        loop[color_layer] = value_to_channel(
-                            value, Echannel, loop[color_layer],
-                            fillgrayscale=True if VCTproperties.inspect_enable else False
-                        )
-                else:
-                    continue
-
-        bmesh_to_object(context, bm, mesh)
-
+    with MeshDataCache(context) as cache:
+        apply_trace_gradient(
+            context, meshes, cache, region, rv3d,
+            lambda positions_2d: linear_trace_values(positions_2d, start_xy, end_xy, InvertGradient)
+        )
     return {'FINISHED'}
 
 
 def fill_gradient_camera_radial(context, center_xy, radius_px, region=None, rv3d=None):
     VCTproperties = context.scene.vct_properties
-    Echannel = VCTproperties.gradient_channel
     InvertGradient = VCTproperties.gradient_invert
-    ColorGradient = VCTproperties.Bcolor_gradient
 
     if radius_px <= 1e-6:
         return {'CANCELLED'}
 
-    # Fallback to active 3D view region/rv3d if not provided
-    if region is None or rv3d is None:
-        area_3d = None
-        for area in context.screen.areas:
-            if area.type == 'VIEW_3D':
-                area_3d = area
-                break
-        if area_3d is None:
-            return {'CANCELLED'}
-        region = next((r for r in area_3d.regions if r.type == 'WINDOW'), None)
-        rv3d = area_3d.spaces.active.region_3d if area_3d.spaces.active else None
-        if region is None or rv3d is None:
-            return {'CANCELLED'}
-
-    c = mathutils.Vector(center_xy)
+    region, rv3d = fetch_region_and_rv3d(context, region, rv3d)
+    if region is None:
+        return {'CANCELLED'}
 
     meshes = fetch_mesh_in_context(context)
     if not meshes:
         return {'CANCELLED'}
 
-    for mesh in meshes:
-        bm = bmesh_from_object(context, mesh)
-        color_layer, bm = fetch_relevant_color_layer(bm, mesh, context)
-        if color_layer is None:
-            bmesh_to_object(context, bm, mesh)
-            continue
-
-        mw = mesh.matrix_world
-        affect_only_selected = getattr(VCTproperties, "affect_only_selected", False)
-        edit_mode = (context.mode == 'EDIT_MESH')
-
-        for face in bm.faces:
-            for loop in face.loops:
-                if should_affect_loop_editmode(VCTproperties, face, loop) or not edit_mode:
-                    world_co = mw @ loop.vert.co
-                    p2d = view3d_utils.location_3d_to_region_2d(region, rv3d, world_co)
-                    if p2d is None:
-                        continue
-
-                    d = (mathutils.Vector((p2d.x, p2d.y)) - c).length
-                    t = max(0.0, min(1.0, d / radius_px))  # 0 at center, 1 at radius
-                    value = t if InvertGradient else 1.0 - t
-
-                    if ColorGradient and not VCTproperties.inspect_enable:
-                        loop[color_layer] = lerp_vector4(
-                            VCTproperties.gradient_color_start,
-                            VCTproperties.gradient_color_end,
-                            value
-                        )
-                    else:
-                        loop[color_layer] = value_to_channel(
-                            value, Echannel, loop[color_layer],
-                            fillgrayscale=True if VCTproperties.inspect_enable else False
-                    )
-                else:
-                    continue
-
-        bmesh_to_object(context, bm, mesh)
-
+    with MeshDataCache(context) as cache:
+        apply_trace_gradient(
+            context, meshes, cache, region, rv3d,
+            lambda positions_2d: radial_trace_values(positions_2d, center_xy, radius_px, InvertGradient)
+        )
     return {'FINISHED'}
-
@@ -0,0 +1,79 @@
+import numpy as np
+
+#---- Component Labeling ----#
+#everything here works on bulk exported index arrays, no bmesh walk involved.
+
+def union_find_labels(count, pairs) -> np.ndarray:
+    """
+    label the connected components of count nodes linked by a (K,2) array of index pairs
+    return one label per node, consecutive from 0
+    """
+    parent = np.arange(count)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    a, b = pairs[:, 0], pairs[:, 1]
+    while True:
+        #hook: every pair links the larger of its two roots under the smaller one
+        root_a, root_b = parent[a], parent[b]
+        low = np.minimum(root_a, root_b)
+        high = np.maximum(root_a, root_b)
+        linked = low != high
+        if not linked.any():
+            break
+        np.minimum.at(parent, high[linked], low[linked])
+        #compress: pointer jumping until every node points straight at its root
+        while True:
+            grand_parent = parent[parent]
+            if np.array_equal(grand_parent, parent):
+                break
+            parent = grand_parent
+    _, labels = np.unique(parent, return_inverse=True)
+    return labels.reshape(-1)
+
+def shared_key_pairs(keys, owners) -> np.ndarray:
+    """
+    return (K,2) pairs of owners that share the same key, chaining each group of equal keys
+    """
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    sorted_owners = owners[order]
+    same = sorted_keys[1:] == sorted_keys[:-1]
+    return np.stack((sorted_owners[:-1][same], sorted_owners[1:][same]), axis=1)
+
+def connected_face_labels(face_count, corner_faces, corner_edges) -> np.ndarray:
+    """
+    label faces that are connected through shared edges, like walking loops across their radial edges
+    """
+    return union_find_labels(face_count, shared_key_pairs(corner_edges, corner_faces))
+
+def next_corner_indices(face_loop_starts, face_loop_totals, corner_faces) -> np.ndarray:
+    """
+    index of the following corner in the same face for every corner, wrapping at the face end
+    """
+    starts = face_loop_starts[corner_faces]
+    offsets = np.arange(len(corner_faces)) - starts
+    return starts + (offsets + 1) % face_loop_totals[corner_faces]
+
+def uv_island_labels(face_loop_starts, face_loop_totals, corner_vertices, corner_edges, uvs, eps=1e-6) -> np.ndarray:
+    """
+    label the UV islands of a mesh, return one island id per corner
+    corners are welded by (vertex index, UV quantized to eps), two faces belong to the same island when they
+    share an edge whose two end corners are welded on both sides
+    """
+    face_count = len(face_loop_starts)
+    corner_faces = np.repeat(np.arange(face_count), face_loop_totals)
+    quantized = np.floor(np.asarray(uvs, dtype=np.float64).reshape(-1, 2) / eps + 0.5).astype(np.int64)
+    _, welds = np.unique(
+        np.column_stack((corner_vertices, quantized)), axis=0, return_inverse=True
+    )
+    welds = welds.reshape(-1)
+
+    #an edge is crossed in opposite directions by its two faces, order its ends by vertex index
+    next_corners = next_corner_indices(face_loop_starts, face_loop_totals, corner_faces)
+    weld_a, weld_b = welds, welds[next_corners]
+    flipped = corner_vertices > corner_vertices[next_corners]
+    low = np.where(flipped, weld_b, weld_a)
+    high = np.where(flipped, weld_a, weld_b)
+    _, edge_keys = np.unique(np.column_stack((corner_edges, low, high)), axis=0, return_inverse=True)
+
+    face_labels = union_find_labels(face_count, shared_key_pairs(edge_keys.reshape(-1), corner_faces))
+    return face_labels[corner_faces]
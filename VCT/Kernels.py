@@ -0,0 +1,139 @@
+import numpy as np
+from .ColorSpace import linear_to_srgb_array, srgb_to_linear_array
+
+#---- Channel Kernels ----#
+#every kernel works in place on an (N,4) float32 array of colors, one row per corner or per vertex for point colors.
+#mask is None to affect every row, or a bool array of N rows that are allowed to change.
+#values can be a scalar or an array of N values, one per row.
+
+CHANNEL_INDEX = {'R': 0, 'G': 1, 'B': 2, 'A': 3}
+
+def _rows(mask):
+    return slice(None) if mask is None else mask
+
+def _masked(values, mask):
+    values = np.asarray(values, dtype=np.float32)
+    if values.ndim and mask is not None:
+        return values[mask]
+    return values
+
+def _write_column(colors, rows, column, values, grayscale):
+    if grayscale:
+        #inspector layer: the value is broadcast to RGB and alpha stays opaque
+        colors[rows, :3] = values[..., None] if values.ndim else values
+        colors[rows, 3] = 1.0
+    else:
+        colors[rows, column] = values
+
+def set_channel(colors, Echannel, values, mask=None, grayscale=False):
+    _write_column(colors, _rows(mask), CHANNEL_INDEX[Echannel], _masked(values, mask), grayscale)
+
+#srgb decodes the stored values to linear before the operation and encodes the result back
+
+def scale_channel(colors, Echannel, factor, mask=None, grayscale=False, srgb=False):
+    rows = _rows(mask)
+    #the inspector layer is grayscale, the value always lives in the first column
+    column = 0 if grayscale else CHANNEL_INDEX[Echannel]
+    values = colors[rows, column]
+    if srgb:
+        values = srgb_to_linear_array(values)
+    values = np.clip(values * factor, 0.0, 1.0)
+    if srgb:
+        values = linear_to_srgb_array(values)
+    _write_column(colors, rows, CHANNEL_INDEX[Echannel], values, grayscale)
+
+def invert_channel(colors, Echannel, mask=None, grayscale=False, srgb=False):
+    rows = _rows(mask)
+    column = 0 if grayscale else CHANNEL_INDEX[Echannel]
+    values = colors[rows, column]
+    if srgb:
+        values = linear_to_srgb_array(1.0 - srgb_to_linear_array(values))
+    else:
+        values = 1.0 - values
+    _write_column(colors, rows, CHANNEL_INDEX[Echannel], values, grayscale)
+
+def swap_channels(colors, Echannel_source, Echannel_target, mask=None):
+    rows = _rows(mask)
+    source = CHANNEL_INDEX[Echannel_source]
+    target = CHANNEL_INDEX[Echannel_target]
+    source_values = colors[rows, source].copy()
+    colors[rows, source] = colors[rows, target]
+    colors[rows, target] = source_values
+
+def fill_color(colors, color, mask=None):
+    colors[_rows(mask)] = np.asarray(color, dtype=np.float32)
+
+def set_colors(colors, values, mask=None):
+    colors[_rows(mask)] = _masked(values, mask)
+
+def lerp_colors(colors, start, end, values, mask=None, srgb=False):
+    start = np.asarray(start, dtype=np.float32)
+    end = np.asarray(end, dtype=np.float32)
+    values = _masked(values, mask)
+    ramp = start + (end - start) * (values[..., None] if values.ndim else values)
+    if srgb:
+        ramp[..., :3] = linear_to_srgb_array(ramp[..., :3])
+    colors[_rows(mask)] = ramp
+
+#---- Projection ----#
+
+def project_positions(positions, direction, matrix=None) -> np.ndarray:
+    """
+    project (V,3) positions onto direction, through an optional 4x4 matrix, as one matrix-vector product
+    """
+    direction = np.asarray(direction, dtype=np.float64)
+    if matrix is None:
+        return positions @ direction
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return positions @ (matrix[:3, :3].T @ direction) + matrix[:3, 3] @ direction
+
+
+#---- Buffer IO ----#
+
+#byte colors are stored as sRGB bytes, color_srgb reads them raw exactly like the bmesh byte layers do
+#float colors are stored linear, color_srgb encodes them on read and decodes on write so both formats hold the same values
+COLOR_VALUE_KEY = 'color_srgb'
+
+def read_attribute_colors(attr) -> np.ndarray:
+    """
+    return the whole color attribute as an (N,4) float32 array, read with a single foreach_get
+    N is the corner count for corner colors and the vertex count for point colors
+    """
+    colors = np.empty(len(attr.data) * 4, dtype=np.float32)
+    attr.data.foreach_get(COLOR_VALUE_KEY, colors)
+    return colors.reshape(-1, 4)
+
+def write_attribute_colors(attr, colors):
+    attr.data.foreach_set(COLOR_VALUE_KEY, np.ascontiguousarray(colors, dtype=np.float32).ravel())
+
+def read_bmesh_colors(elements, color_layer, linear=False) -> np.ndarray:
+    """
+    return an (len(elements),4) float32 array of a bmesh color layer, loops or verts
+    linear float layers are encoded to sRGB, matching read_attribute_colors
+    """
+    colors = [tuple(element[color_layer]) for element in elements]
+    colors = np.array(colors, dtype=np.float32).reshape(-1, 4)
+    if linear:
+        colors[:, :3] = linear_to_srgb_array(colors[:, :3])
+    return colors
+
+def write_bmesh_colors(elements, color_layer, colors, linear=False):
+    if linear:
+        colors = colors.copy()
+        colors[:, :3] = srgb_to_linear_array(colors[:, :3])
+    for element, color in zip(elements, colors.tolist()):
+        element[color_layer] = color
+
+def project_to_region(positions, perspective_matrix, matrix_world, width, height) -> np.ndarray:
+    """
+    project (V,3) local positions to region pixels for every vertex at once
+    same math as view3d_utils.location_3d_to_region_2d, rows behind the view come back as nan
+    """
+    matrix = np.asarray(perspective_matrix, dtype=np.float64) @ np.asarray(matrix_world, dtype=np.float64)
+    clip = positions @ matrix[:, :3].T + matrix[:, 3]
+    w = clip[:, 3]
+    in_front = w > 0.0
+    half = np.array((width / 2.0, height / 2.0))
+    positions_2d = np.full((len(positions), 2), np.nan)
+    positions_2d[in_front] = half + half * (clip[in_front, :2] / w[in_front, None])
+    return positions_2d
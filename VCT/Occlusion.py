@@ -0,0 +1,88 @@
+import numpy as np
+from mathutils.bvhtree import BVHTree
+
+#---- Raycast Occlusion ----#
+#ambient occlusion computed straight from vertex positions and normals, no UV map, image or cycles bake involved.
+
+def transform_points(positions, matrix) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return positions @ matrix[:3, :3].T + matrix[:3, 3]
+
+def transform_normals(normals, matrix) -> np.ndarray:
+    """
+    transform (V,3) normals by the inverse transpose of the matrix, renormalized
+    """
+    normal_matrix = np.linalg.inv(np.asarray(matrix, dtype=np.float64)[:3, :3]).T
+    normals = normals @ normal_matrix.T
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals / np.maximum(lengths, 1e-12)
+
+def build_occluder_tree(triangle_sets) -> BVHTree:
+    """
+    one BVHTree over every (positions, triangles) pair, positions already in world space
+    """
+    positions = []
+    triangles = []
+    offset = 0
+    for set_positions, set_triangles in triangle_sets:
+        positions.append(set_positions)
+        triangles.append(set_triangles + offset)
+        offset += len(set_positions)
+    positions = np.concatenate(positions) if positions else np.zeros((0, 3))
+    triangles = np.concatenate(triangles) if triangles else np.zeros((0, 3), dtype=np.int64)
+    return BVHTree.FromPolygons(positions.tolist(), triangles.tolist())
+
+def hemisphere_directions(count, cosine_weighted=True):
+    """
+    return (R,3) directions spread over the +Z hemisphere on a fibonacci spiral and the weight of each ray
+    cosine weighted rays are distributed along cos(theta) like the cycles AO pass, otherwise uniformly over the solid angle,
+    either way the distribution already carries the weighting so every hit counts the same
+    """
+    index = np.arange(count) + 0.5
+    if cosine_weighted:
+        z = np.sqrt(1.0 - index / count)
+    else:
+        z = 1.0 - index / count
+    radius = np.sqrt(np.maximum(1.0 - z * z, 0.0))
+    angle = index * np.pi * (3.0 - np.sqrt(5.0))
+    directions = np.column_stack((radius * np.cos(angle), radius * np.sin(angle), z))
+    weights = np.full(count, 1.0 / count)
+    return directions, weights
+
+def tangent_frames(normals):
+    """
+    return two (V,3) unit tangents perpendicular to every normal and to each other
+    """
+    #pick the world axis least aligned with each normal to build a stable frame
+    helper = np.zeros_like(normals)
+    helper[np.arange(len(normals)), np.argmin(np.abs(normals), axis=1)] = 1.0
+    tangents = np.cross(normals, helper)
+    tangents /= np.maximum(np.linalg.norm(tangents, axis=1, keepdims=True), 1e-12)
+    bitangents = np.cross(normals, tangents)
+    return tangents, bitangents
+
+def vertex_occlusion_chunks(tree, origins, normals, ray_count, distance, cosine_weighted=True, chunk_size=2048):
+    """
+    yield (start, ao) for consecutive chunks of vertices, ao being 1 where nothing is hit and 0 when fully occluded
+    origins should already be offset along their normals to avoid self hits
+    """
+    directions, weights = hemisphere_directions(ray_count, cosine_weighted)
+    weights = weights.tolist()
+    ray_cast = tree.ray_cast
+    for start in range(0, len(origins), chunk_size):
+        chunk_normals = normals[start:start + chunk_size]
+        tangents, bitangents = tangent_frames(chunk_normals)
+        #(C,R,3) world directions of every ray of the chunk in one product
+        world_directions = (
+            tangents[:, None, :] * directions[None, :, 0, None]
+            + bitangents[:, None, :] * directions[None, :, 1, None]
+            + chunk_normals[:, None, :] * directions[None, :, 2, None]
+        )
+        ao = np.empty(len(chunk_normals), dtype=np.float32)
+        for i, (origin, rays) in enumerate(zip(origins[start:start + chunk_size].tolist(), world_directions.tolist())):
+            hit = 0.0
+            for direction, weight in zip(rays, weights):
+                if ray_cast(origin, direction, distance)[0] is not None:
+                    hit += weight
+            ao[i] = 1.0 - hit
+        yield start, ao
@@ -156,16 +156,67 @@ class VCT_SwitchChannel(bpy.types.Operator):
 class VCT_AOToVertexColor(bpy.types.Operator):
     bl_idname = "vct.ao_to_vertex_color"
     bl_label = "Bake AO to Vertex Color"
-    bl_description = "Bake Ambient Occlusion to the selected vertex color channel of selected mesh objects"
+    bl_description = "Bake Ambient Occlusion to the selected vertex color channel of selected mesh objects, ESC to cancel"
     bl_options = {'REGISTER', 'UNDO'}
 
+    job = None
+    _timer = None
+
     @classmethod
     def poll(cls, context):
         return context.mode == 'OBJECT'
 
+    def invoke(self, context, event):
+        self.job = None
+        self._timer = None
+        return ao_bake_invoke(self, context)
+
+    def modal(self, context, event):
+        return ao_bake_modal(self, context, event)
+
     def execute(self, context):
-        return bake_ao_to_vertex_color(context)
+        return bake_ao_to_vertex_color(context, report=self.report)
     
+class VCT_TextureToVertexColor(bpy.types.Operator):
+    bl_idname = "vct.texture_to_vertex_color"
+    bl_label = "Texture to Vertex Color"
+    bl_description = "Sample an image through a UV map into a vertex color channel, or the full color, of selected mesh objects"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.vct_properties.texture_image is not None
+
+    def execute(self, context):
+        result = texture_to_vertex_color(context)
+        if 'CANCELLED' in result:
+            self.report({'WARNING'}, "No image data or no selected mesh to transfer to")
+        return result
+
+class VCT_ConvertColorAttribute(bpy.types.Operator):
+    bl_idname = "vct.convert_color_attribute"
+    bl_label = "Convert Color Attribute"
+    bl_description = "Convert the active color attribute of selected mesh objects, otherwise byte and float, vertex and face corner colors are edited as they are"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    domain: bpy.props.EnumProperty(
+        name="Domain",
+        items=[('CORNER', "Face Corner", "One color per face corner"), ('POINT', "Vertex", "One color per vertex")],
+        default='CORNER'
+    )
+    data_type: bpy.props.EnumProperty(
+        name="Data Type",
+        items=[('BYTE_COLOR', "Byte", "8 bit sRGB color"), ('FLOAT_COLOR', "Float", "32 bit linear color")],
+        default='BYTE_COLOR'
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return not context.scene.vct_properties.inspect_enable
+
+    def execute(self, context):
+        return convert_color_attributes(context, self.domain, self.data_type)
+
 class VCT_InvertChannel(bpy.types.Operator):
     bl_idname = "vct.invert_channel"
     bl_label = "Invert Channel"
@@ -191,11 +242,14 @@ class VCT_TraceGradient(bpy.types.Operator):
     #ref to the draw handler
     handle = None
     shader = None
+    #live preview session while dragging
+    preview = None
 
     def invoke(self, context, event):
         self.start = None
         self.current = None
         self.is_drawing = False
+        self.preview = None
 
         if self.Bcircle:
             context.scene.vct_properties.trace_gradient_active[1] = not context.scene.vct_properties.trace_gradient_active[1]
@@ -231,6 +285,8 @@ _classes = (
     VCT_SwitchChannel,
     VCT_Fill1Channel,
     VCT_AOToVertexColor,
+    VCT_TextureToVertexColor,
+    VCT_ConvertColorAttribute,
     VCT_InvertChannel,
     VCT_TraceGradient,
 )
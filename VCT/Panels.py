@@ -127,6 +127,11 @@ class VCT_Panel(bpy.types.Panel):
                 row.prop(vct_props, "gradient_invert", text="Invert Gradient", toggle=True)
                 row = go_to_row(box)
                 row.prop(vct_props, "Bcolor_gradient", text="Color Gradient", toggle=True)
+                row = go_to_row(box, scale_y=1.0, align=True)
+                row.prop(vct_props, "Btrace_preview", text="Live Trace Preview", toggle=True)
+                sub = row.row(align=True)
+                sub.enabled = vct_props.Btrace_preview
+                sub.prop(vct_props, "trace_preview_budget", text="Budget")
 
 
             box = dropdown_menu(layout, vct_props, "Bshow_random", "Random Fill", section_icon='POINTCLOUD_POINT')
@@ -141,6 +146,11 @@ class VCT_Panel(bpy.types.Panel):
                 row.prop(vct_props, "random_per_vertex", text="Per Vertex", toggle=True)
                 row = go_to_row(box, scale_y=1.0)
                 row.prop(vct_props, "random_normalize", text="Normalize Random Values", toggle=True)
+                row = go_to_row(box, scale_y=1.0, align=True)
+                row.prop(vct_props, "random_use_seed", text="Use Seed", toggle=True)
+                sub = row.row(align=True)
+                sub.enabled = vct_props.random_use_seed
+                sub.prop(vct_props, "random_seed", text="Seed")
 
             box = dropdown_menu(layout, vct_props, "Bshow_managing", "Managing Channel", section_icon='SETTINGS')
             if box:
@@ -154,6 +164,8 @@ class VCT_Panel(bpy.types.Panel):
                 row = go_to_row(box, align=True)
                 row.operator("vct.bias_channel", text="Bias Channel", icon='MODIFIER')
                 row.prop(vct_props, "bias_percent", text="")
+                row = go_to_row(box, scale_y=1.0)
+                row.operator_menu_enum("vct.convert_color_attribute", "domain", text="Convert Color Attribute", icon='GROUP_VCOL')
         
 
             box = dropdown_menu(layout, vct_props, "Bshow_switch", "Switch Channels", section_icon='ARROW_LEFTRIGHT')
@@ -172,12 +184,52 @@ class VCT_Panel(bpy.types.Panel):
                 row = go_to_row(box, scale_y=1.0)
                 row.prop(vct_props, "ao_vertex_channel", text="AO Channel", expand=True)
                 row = go_to_row(box, scale_y=1.0)
-                row.prop(vct_props, "ao_uv_index", text="UV Map")
+                row.prop(vct_props, "ao_engine", text="Engine", expand=True)
                 row = go_to_row(box, scale_y=1.0)
-                row.prop(vct_props, "ao_texture_size", text="Texture Size")
-                if vct_props.ao_show_percent:
+                row.prop(vct_props, "ao_incremental", text="Skip Unchanged", toggle=True)
+                if vct_props.ao_engine == 'RAYCAST':
+                    row = go_to_row(box, scale_y=1.0, align=True)
+                    row.prop(vct_props, "ao_ray_count", text="Rays")
+                    row.prop(vct_props, "ao_ray_distance", text="Distance")
+                    row = go_to_row(box, scale_y=1.0)
+                    row.prop(vct_props, "ao_cosine_weighted", text="Cosine Weighted", toggle=True)
+                else:
                     row = go_to_row(box, scale_y=1.0)
+                    row.prop(vct_props, "ao_uv_index", text="UV Map")
+                    row = go_to_row(box, scale_y=1.0)
+                    row.prop(vct_props, "ao_texture_size", text="Max Size" if vct_props.ao_adaptive_size else "Texture Size")
+                    row = go_to_row(box, scale_y=1.0, align=True)
+                    row.prop(vct_props, "ao_adaptive_size", text="Adaptive Size", toggle=True)
+                    if vct_props.ao_adaptive_size:
+                        row.prop(vct_props, "ao_texels_per_corner", text="Texels/Corner")
+                    row = go_to_row(box, scale_y=1.0)
+                    row.prop(vct_props, "ao_batch_bake", text="Batch Bake", toggle=True)
+                    row = go_to_row(box, scale_y=1.0, align=True)
+                    row.prop(vct_props, "ao_filter", text="Filter")
+                    if vct_props.ao_filter in {'BOX', 'GAUSSIAN'}:
+                        row.prop(vct_props, "ao_filter_taps", text="Taps")
+                if vct_props.ao_show_percent:
+                    row = go_to_row(box, scale_y=1.0, align=True)
                     row.prop(vct_props, "ao_percent", text="Progress")
+                    row.label(text=f"ETA {vct_props.ao_eta:.0f}s")
+
+            box = dropdown_menu(layout, vct_props, "Bshow_texture", "Texture to Vertex Color", section_icon='TEXTURE')
+            if box:
+                row = go_to_row(box)
+                row.operator("vct.texture_to_vertex_color", text="Texture to Vertex Color", icon='TEXTURE')
+                row = go_to_row(box, scale_y=1.0)
+                row.template_ID(vct_props, "texture_image", open="image.open")
+                row = go_to_row(box, scale_y=1.0)
+                row.prop(vct_props, "texture_target_channel", text="Target", expand=True)
+                if vct_props.texture_target_channel != 'RGBA':
+                    row = go_to_row(box, scale_y=1.0)
+                    row.prop(vct_props, "texture_source_channel", text="Source", expand=True)
+                row = go_to_row(box, scale_y=1.0)
+                row.prop(vct_props, "texture_uv_index", text="UV Map")
+                row = go_to_row(box, scale_y=1.0, align=True)
+                row.prop(vct_props, "texture_filter", text="Filter")
+                if vct_props.texture_filter in {'BOX', 'GAUSSIAN'}:
+                    row.prop(vct_props, "texture_filter_taps", text="Taps")
 
         #special pannel when inspecting    
         else:
@@ -204,6 +256,11 @@ class VCT_Panel(bpy.types.Panel):
             row.prop(vct_props, "random_per_vertex", text="Per Vertex", toggle=True)
             row = go_to_row(layout, scale_y=1.0)
             row.prop(vct_props, "random_normalize", text="Normalize Random Values", toggle=True)
+            row = go_to_row(layout, scale_y=1.0, align=True)
+            row.prop(vct_props, "random_use_seed", text="Use Seed", toggle=True)
+            sub = row.row(align=True)
+            sub.enabled = vct_props.random_use_seed
+            sub.prop(vct_props, "random_seed", text="Seed")
 
             layout.separator()
             # Gradient Fill buttons and options
@@ -1,5 +1,5 @@
 import bpy
-from bpy.props import (BoolProperty, FloatVectorProperty, EnumProperty, PointerProperty, IntProperty, StringProperty, FloatProperty)
+from bpy.props import (BoolProperty, FloatVectorProperty, EnumProperty, PointerProperty, IntProperty, StringProperty, FloatProperty, CollectionProperty)
 from bpy.types import PropertyGroup
 
 Echannel_source = [
@@ -8,11 +8,28 @@ Echannel_source = [
             ('B', "Blue", "Blue Channel"),
             ('A', "Alpha", "Alpha Channel"),
         ]
+Echannel_texture_target = [
+            ('R', "Red", "Red Channel"),
+            ('G', "Green", "Green Channel"),
+            ('B', "Blue", "Blue Channel"),
+            ('A', "Alpha", "Alpha Channel"),
+            ('RGBA', "RGBA", "Whole color"),
+        ]
 Echannel_axis = [
             ('X', "X-Axis", "X-Axis"),
             ('Y', "Y-Axis", "Y-Axis"),
             ('Z', "Z-Axis", "Z-Axis"),
         ]
+Echannel_filter = [
+            ('NEAREST', "Nearest", "Closest texel, fastest"),
+            ('BILINEAR', "Bilinear", "Blend the four texels around each corner"),
+            ('BOX', "Box", "Average a grid of taps over the texel footprint of each corner"),
+            ('GAUSSIAN', "Gaussian", "Gaussian weighted grid of taps over the texel footprint of each corner"),
+        ]
+Echannel_ao_engine = [
+            ('BAKE', "Bake", "Cycles AO bake through a UV map, sampled back to the corners"),
+            ('RAYCAST', "Raycast", "Cast hemisphere rays from every vertex, no UV map needed"),
+        ]
 Echannel_resolution = [
             ('256', "Low (256x256)", "Low Resolution 256x256"),
             ('512', "Medium (512x512)", "Medium Resolution 512x512"),
@@ -21,6 +38,16 @@ Echannel_resolution = [
             ('4096', "Extreme (4096x4096)", "Extreme Resolution 4096x4096"),
         ]
 
+class VCTInspectItem(PropertyGroup):
+    obj: PointerProperty(
+        name="Object",
+        type=bpy.types.Object
+    )
+    attribute_name: StringProperty(
+        name="Inspected Attribute",
+        description="Color attribute the inspect channel is read from and written back to"
+    )
+
 class VCTProperties(PropertyGroup):
     fill_color: FloatVectorProperty(
         name="Fill Color",
@@ -81,6 +108,18 @@ class VCTProperties(PropertyGroup):
         size=2,
         default=(False, False)
     )
+    Btrace_preview: BoolProperty(
+        name="Live Trace Preview",
+        description="Preview the traced gradient on the mesh while dragging",
+        default=True
+    )
+    trace_preview_budget: FloatProperty(
+        name="Preview Budget (ms)",
+        description="Time allowed per preview refresh in milliseconds, heavier meshes only refresh part of their corners per event",
+        default=30.0,
+        min=1.0,
+        soft_max=200.0,
+    )
     Bcolor_gradient: BoolProperty(
         name="Color Gradient",
         default=False
@@ -125,10 +164,29 @@ class VCTProperties(PropertyGroup):
         name="Random Per UV Island",
         default=False
     )
+    random_use_seed: BoolProperty(
+        name="Use Seed",
+        description="Generate the same random values every time for the same objects and seed",
+        default=False
+    )
+    random_seed: IntProperty(
+        name="Seed",
+        description="Seed of the random values, combined with each object name",
+        default=0,
+        min=0
+    )
     inspect_enable: BoolProperty(
         name="Inspect Mode",
         default=False
     )
+    inspect_objects: CollectionProperty(
+        name="Inspected Objects",
+        type=VCTInspectItem
+    )
+    inspect_token: StringProperty(
+        name="Inspect Session Token",
+        description="Changes with every change of the inspected objects, keys the lookup index built from them"
+    )
     inspect_channel: EnumProperty(
         name="Inspect Channel",
         items=Echannel_source,
@@ -162,6 +220,30 @@ class VCTProperties(PropertyGroup):
         items=Echannel_source,
         default='R'
     )
+    ao_engine: EnumProperty(
+        name="AO Engine",
+        items=Echannel_ao_engine,
+        default='BAKE'
+    )
+    ao_ray_count: IntProperty(
+        name="Rays",
+        description="Rays cast from every vertex",
+        default=64,
+        min=4,
+        soft_max=512
+    )
+    ao_ray_distance: FloatProperty(
+        name="Distance",
+        description="Occluders further than this distance are ignored",
+        default=1.0,
+        min=0.0,
+        subtype='DISTANCE'
+    )
+    ao_cosine_weighted: BoolProperty(
+        name="Cosine Weighted",
+        description="Weight rays by the cosine to the normal, grazing occluders darken less",
+        default=True
+    )
     ao_uv_index: IntProperty(
         name="UV Map Index",
         default=0
@@ -171,6 +253,75 @@ class VCTProperties(PropertyGroup):
         items=Echannel_resolution,
         default='1024'
     )
+    ao_adaptive_size: BoolProperty(
+        name="Adaptive Size",
+        description="Pick the bake size per object from its UV coverage and corner count, Texture Size becomes the maximum",
+        default=False
+    )
+    ao_texels_per_corner: FloatProperty(
+        name="Texels per Corner",
+        description="Texels of the baked image each corner should get with Adaptive Size",
+        default=16.0,
+        min=1.0,
+        soft_max=256.0
+    )
+    ao_batch_bake: BoolProperty(
+        name="Batch Bake",
+        description="Bake every selected object in a single Cycles bake, each into its own image, instead of one bake per object",
+        default=True
+    )
+    ao_incremental: BoolProperty(
+        name="Skip Unchanged",
+        description="Skip objects whose geometry, UVs, occluders and bake settings didn't change since their last AO bake",
+        default=False
+    )
+    ao_filter: EnumProperty(
+        name="AO Filter",
+        description="How the baked texture is sampled at each corner, filtering allows lower bake resolutions",
+        items=Echannel_filter,
+        default='NEAREST'
+    )
+    ao_filter_taps: IntProperty(
+        name="Filter Taps",
+        description="Taps per axis for the Box and Gaussian filters",
+        default=3,
+        min=2,
+        max=8
+    )
+    texture_image: PointerProperty(
+        name="Texture",
+        description="Image sampled into the vertex colors, packed images work as well",
+        type=bpy.types.Image
+    )
+    texture_uv_index: IntProperty(
+        name="UV Map Index",
+        default=0,
+        min=0
+    )
+    texture_source_channel: EnumProperty(
+        name="Texture Source Channel",
+        description="Image channel read when writing a single vertex color channel",
+        items=Echannel_source,
+        default='R'
+    )
+    texture_target_channel: EnumProperty(
+        name="Texture Target Channel",
+        items=Echannel_texture_target,
+        default='RGBA'
+    )
+    texture_filter: EnumProperty(
+        name="Texture Filter",
+        description="How the image is sampled at each corner",
+        items=Echannel_filter,
+        default='BILINEAR'
+    )
+    texture_filter_taps: IntProperty(
+        name="Filter Taps",
+        description="Taps per axis for the Box and Gaussian filters",
+        default=3,
+        min=2,
+        max=8
+    )
     ao_percent: FloatProperty(
         name="AO Process %",
         default=1.0,
@@ -179,6 +330,12 @@ class VCTProperties(PropertyGroup):
         subtype='PERCENTAGE',
         precision=3,
     )
+    ao_eta: FloatProperty(
+        name="AO Time Left",
+        description="Estimated seconds left in the running AO bake",
+        default=0.0,
+        min=0.0
+    )
     ao_show_percent: BoolProperty(
         name="Show AO Progress %",
         default=False
@@ -207,6 +364,10 @@ class VCTProperties(PropertyGroup):
         name="Show Ambient Occlusion Options",
         default=False
     )
+    Bshow_texture: BoolProperty(
+        name="Show Texture to Vertex Color Options",
+        default=False
+    )
     Bedit_face_mode: BoolProperty(
         name="Edit Mode: Use Face Selection",
         description="When enabled, affects only selected faces in Edit Mode (prevents painting across shared vertices / bleeding).",
@@ -224,6 +385,7 @@ class VCTProperties(PropertyGroup):
 
 
 _classes = (
+    VCTInspectItem,
     VCTProperties,
     )
 
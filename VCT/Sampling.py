@@ -0,0 +1,121 @@
+import numpy as np
+from .Islands import next_corner_indices
+
+#---- Image Sampling ----#
+#images are read once into float32 buffers and sampled for every corner at once through their UVs.
+
+def read_image_pixels(image, buffer=None) -> np.ndarray:
+    """
+    return the image pixels as an (H,W,4) float32 array, read with a single foreach_get
+    pass the buffer of a previous read to reuse it when the size matches
+    """
+    width, height = image.size
+    size = width * height * 4
+    if buffer is None or buffer.size != size:
+        buffer = np.empty(size, dtype=np.float32)
+    image.pixels.foreach_get(buffer)
+    return buffer.reshape(height, width, 4)
+
+def texel_indices(uvs, width, height):
+    """
+    return the (x, y) texel column and row of every UV, clamped to the image like the nearest lookup
+    """
+    px = np.clip((uvs[:, 0] * width).astype(np.int64), 0, width - 1)
+    py = np.clip((uvs[:, 1] * height).astype(np.int64), 0, height - 1)
+    return px, py
+
+def sample_nearest(pixels, uvs, channel=0) -> np.ndarray:
+    """
+    nearest texel lookup of an (H,W,4) pixel array for (N,2) uvs, channel is an index or a slice of RGBA
+    """
+    height, width = pixels.shape[:2]
+    px, py = texel_indices(uvs, width, height)
+    return pixels[py, px, channel]
+
+def sample_bilinear(pixels, uvs, channel=0) -> np.ndarray:
+    """
+    bilinear lookup between the four texels around each UV, texel centers at half integer coordinates
+    """
+    height, width = pixels.shape[:2]
+    x = uvs[:, 0] * width - 0.5
+    y = uvs[:, 1] * height - 0.5
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    fx = (x - x0).astype(np.float32)
+    fy = (y - y0).astype(np.float32)
+    x0 = x0.astype(np.int64)
+    y0 = y0.astype(np.int64)
+    x1 = np.clip(x0 + 1, 0, width - 1)
+    y1 = np.clip(y0 + 1, 0, height - 1)
+    x0 = np.clip(x0, 0, width - 1)
+    y0 = np.clip(y0, 0, height - 1)
+
+    top = _lerp(pixels[y0, x0, channel], pixels[y0, x1, channel], fx)
+    bottom = _lerp(pixels[y1, x0, channel], pixels[y1, x1, channel], fx)
+    return _lerp(top, bottom, fy)
+
+def _lerp(a, b, t):
+    if a.ndim == 2:
+        t = t[:, None]
+    return a + (b - a) * t
+
+def sample_footprint(pixels, uvs, radius, taps=3, filter_type='BOX', channel=0) -> np.ndarray:
+    """
+    average taps x taps bilinear samples spread over a square of +/- radius texels around each UV
+    radius is a scalar or one value per UV, GAUSSIAN weights the taps toward the center
+    """
+    height, width = pixels.shape[:2]
+    radius = np.asarray(radius, dtype=np.float64)
+    offsets = np.linspace(-1.0, 1.0, taps) if taps > 1 else np.zeros(1)
+    total = None
+    total_weight = 0.0
+    for oy in offsets:
+        for ox in offsets:
+            weight = float(np.exp(-(ox * ox + oy * oy) / 0.5)) if filter_type == 'GAUSSIAN' else 1.0
+            shifted = np.column_stack((uvs[:, 0] + ox * radius / width, uvs[:, 1] + oy * radius / height))
+            sample = sample_bilinear(pixels, shifted, channel) * weight
+            total = sample if total is None else total + sample
+            total_weight += weight
+    return total / total_weight
+
+def face_uv_areas(uvs, face_loop_starts, face_loop_totals, corner_faces=None) -> np.ndarray:
+    """
+    UV space area of every face, shoelace formula with one cross product per corner summed per face
+    """
+    face_count = len(face_loop_starts)
+    if corner_faces is None:
+        corner_faces = np.repeat(np.arange(face_count), face_loop_totals)
+    next_uvs = uvs[next_corner_indices(face_loop_starts, face_loop_totals, corner_faces)]
+    cross = uvs[:, 0] * next_uvs[:, 1] - next_uvs[:, 0] * uvs[:, 1]
+    return np.abs(np.bincount(corner_faces, weights=cross, minlength=face_count)) * 0.5
+
+def corner_footprint_radius(uvs, face_loop_starts, face_loop_totals, width, height, max_radius=8.0) -> np.ndarray:
+    """
+    per corner footprint radius in texels: half the side of the texel area its face covers, split over its corners
+    """
+    corner_faces = np.repeat(np.arange(len(face_loop_starts)), face_loop_totals)
+    face_area = face_uv_areas(uvs, face_loop_starts, face_loop_totals, corner_faces)
+    texels = face_area * width * height / np.maximum(face_loop_totals, 1)
+    return np.clip(0.5 * np.sqrt(texels), 0.5, max_radius)[corner_faces]
+
+def adaptive_bake_size(uv_area, corner_count, texels_per_corner, sizes, max_size) -> int:
+    """
+    smallest square size from sizes giving every corner about texels_per_corner texels of its UV area, capped at max_size
+    """
+    #only the covered part of the image holds texels for the corners
+    needed = np.sqrt(corner_count * texels_per_corner / max(uv_area, 1e-8))
+    for size in sorted(sizes):
+        if size >= min(needed, max_size):
+            return size
+    return max_size
+
+def sample_image(pixels, uvs, filter_type='NEAREST', channel=0, radius=None, taps=3) -> np.ndarray:
+    """
+    sample an (H,W,4) pixel array at (N,2) uvs with the chosen filter: NEAREST, BILINEAR, BOX or GAUSSIAN
+    BOX and GAUSSIAN need a footprint radius in texels
+    """
+    if filter_type == 'BILINEAR':
+        return sample_bilinear(pixels, uvs, channel)
+    if filter_type in {'BOX', 'GAUSSIAN'}:
+        return sample_footprint(pixels, uvs, radius, taps, filter_type, channel)
+    return sample_nearest(pixels, uvs, channel)
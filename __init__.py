@@ -14,7 +14,13 @@ bl_info = {
 
 
 _SubModules = [
+    "VCT.ColorSpace",
+    "VCT.Kernels",
+    "VCT.Islands",
+    "VCT.Sampling",
+    "VCT.Occlusion",
     "VCT.Functions",
+    "VCT.Batch",
     "VCT.Properties",
     "VCT.Operators",
     "VCT.Panels",